@@ -13,16 +13,78 @@ Usage:
 """
 
 import argparse
+import copy
 import csv
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pyarrow as pa
+import pyarrow.compute as pc
 import yaml
+from pyarrow import csv as pacsv
+from collections import OrderedDict
 from pathlib import Path
+from types import SimpleNamespace
 import re
 
+# Read/write buffer for streaming CSV rewrites
+STREAM_BUFFER_SIZE = 1 << 20
+
+# Output fragments buffered before each writelines() call
+WRITE_BATCH_SIZE = 4096
+
+# Bytes read to find a CSV header line
+HEADER_PEEK_SIZE = 4096
+
+# Arrow CSV reader block size for (wide, large) AWS CUR files
+CSV_BLOCK_SIZE = 64 << 20
+
+# AWS CUR columns that may carry each OpenShift tag (direct or ResourceTag form)
+TAG_COLUMNS = {
+    tag: (tag, f'resourceTags/user:{tag}') for tag in ('openshift_cluster', 'openshift_node')
+}
+
+# Upper bound on alignment worker processes
+MAX_ALIGN_WORKERS = 8
+
+# Column names containing both 'resource' and 'id', in any case
+RESOURCE_COLUMN_RE = re.compile(r'(?=.*resource)(?=.*id)', re.IGNORECASE)
+
+# Parsed manifests by path -> (mtime, size, expected), most recently used last
+MANIFEST_CACHE_SIZE = 16
+_manifest_cache = OrderedDict()
+
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 
 def load_manifest(manifest_path):
-    """Load test manifest and extract expected resource IDs, tags, and cluster info."""
+    """Load test manifest and extract expected resource IDs, tags, and cluster info.
+
+    Results are cached per path and reused while the file's mtime and size are unchanged.
+    """
+    key = os.path.abspath(manifest_path)
+    st = os.stat(key)
+    cached = _manifest_cache.get(key)
+    if cached and cached[:2] == (st.st_mtime, st.st_size):
+        _manifest_cache.move_to_end(key)
+        # Deep copy: callers get their own dicts/sets to mutate
+        return copy.deepcopy(cached[2])
+
+    expected = _parse_manifest(key)
+    _manifest_cache[key] = (st.st_mtime, st.st_size, copy.deepcopy(expected))
+    if len(_manifest_cache) > MANIFEST_CACHE_SIZE:
+        _manifest_cache.popitem(last=False)
+    return expected
+
+
+def _parse_manifest(manifest_path):
+    """Parse a test manifest into expected resource IDs, tags, and cluster info."""
     with open(manifest_path, 'r') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=YAML_LOADER)
 
     expected = {
         'ocp_nodes': {},      # node_name -> resource_id
@@ -70,30 +132,66 @@ def align_ocp_pod_usage(csv_path, expected_nodes):
     # Get the first (usually only) expected resource_id
     # Nise generates random node_names too, so we can't match by name
     # Instead, replace ALL resource_ids with the expected one
-    expected_ids = list(expected_nodes.values())
-    if not expected_ids:
-        return
-
-    expected_id = expected_ids[0]
+    expected_id = next(iter(expected_nodes.values()))
 
     temp_path = csv_path.with_suffix('.tmp')
     updated = 0
 
-    with open(csv_path, 'r') as infile, open(temp_path, 'w') as outfile:
-        reader = csv.DictReader(infile)
-        writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
-        writer.writeheader()
-
-        for row in reader:
-            # Replace ALL resource_ids (nise generates random node names too)
-            if row.get('resource_id'):
-                row['resource_id'] = expected_id
-                updated += 1
+    # Only resource_id changes, so each line is split and spliced as raw bytes, without
+    # decoding it or parsing it into a row; lines with quoted fields (which may hold
+    # commas) are decoded and go through csv
+    with open(csv_path, 'rb', buffering=STREAM_BUFFER_SIZE) as infile:
+        header = infile.readline()
+        fields = next(csv.reader([header.decode('utf-8')]), [])
+        if 'resource_id' not in fields:
+            print(f"  ⚠️  No resource_id column found in {csv_path.name}")
+            return
+        idx = fields.index('resource_id')
+        expected_bytes = expected_id.encode('utf-8')
+
+        with open(temp_path, 'wb', buffering=STREAM_BUFFER_SIZE) as outfile:
+            # Output is collected into batches (quoted rows too, via the writer's target)
+            # and handed to writelines, instead of one write call per fragment
+            batch = []
+            quoted_writer = csv.writer(
+                SimpleNamespace(write=lambda text: batch.append(text.encode('utf-8'))), lineterminator=''
+            )
+            outfile.write(header)
+
+            for line in infile:
+                body = line.rstrip(b'\r\n')
+                ending = line[len(body):]
+
+                # Replace ALL resource_ids (nise generates random node names too)
+                if b'"' in body:
+                    parts = next(csv.reader([body.decode('utf-8')]))
+                    if idx < len(parts) and parts[idx]:
+                        parts[idx] = expected_id
+                        updated += 1
+                    quoted_writer.writerow(parts)
+                else:
+                    # Split only up to resource_id; the tail stays one piece
+                    parts = body.split(b',', idx + 1)
+                    if idx < len(parts) and parts[idx]:
+                        parts[idx] = expected_bytes
+                        updated += 1
+                    batch.append(b','.join(parts))
+                batch.append(ending)
+
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    outfile.writelines(batch)
+                    batch.clear()
+
+            outfile.writelines(batch)
+
+    os.replace(temp_path, csv_path)
+    print(f"  ✓ Aligned {updated} rows in {csv_path.name} (resource_id -> {expected_id})")
 
-            writer.writerow(row)
 
-    temp_path.replace(csv_path)
-    print(f"  ✓ Aligned {updated} rows in {csv_path.name} (resource_id -> {expected_id})")
+@functools.lru_cache(maxsize=32)
+def _find_resource_column(columns):
+    """Find the resource ID column (might be lineItem/ResourceId or lineitem_resourceid) of a CSV header."""
+    return next((col for col in columns if RESOURCE_COLUMN_RE.search(col)), None)
 
 
 def align_aws_cur(csv_path, expected_resources, expected_tags=None):
@@ -107,60 +205,75 @@ def align_aws_cur(csv_path, expected_resources, expected_tags=None):
         print(f"  ⚠️  Expected 1 AWS resource, found {len(expected_resources)}")
         return
 
-    expected_id = list(expected_resources)[0]
+    expected_id = next(iter(expected_resources))
     if expected_tags is None:
         expected_tags = {}
     temp_path = csv_path.with_suffix('.tmp')
-    updated = 0
 
-    with open(csv_path, 'r') as infile, open(temp_path, 'w') as outfile:
-        reader = csv.DictReader(infile)
+    with open(csv_path, 'r', newline='') as f:
+        columns = next(csv.reader(f), [])
 
-        # Find resource_id column (might be lineItem/ResourceId or lineitem_resourceid)
-        resource_col = None
-        for col in reader.fieldnames:
-            if 'resource' in col.lower() and 'id' in col.lower():
-                resource_col = col
-                break
+    resource_col = _find_resource_column(tuple(columns))
 
-        if not resource_col:
-            print(f"  ⚠️  No resource_id column found in AWS CSV")
-            return
+    if not resource_col:
+        print(f"  ⚠️  No resource_id column found in AWS CSV")
+        return
 
-        writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
-        writer.writeheader()
-
-        for row in reader:
-            # Fix resource ID
-            if row.get(resource_col):
-                row[resource_col] = expected_id
-                updated += 1
-
-            # Fix OpenShift tags (for tag matching scenarios)
-            if expected_tags:
-                if 'openshift_cluster' in expected_tags:
-                    # Direct column
-                    if 'openshift_cluster' in row:
-                        row['openshift_cluster'] = expected_tags['openshift_cluster']
-                    # ResourceTag column
-                    if 'resourceTags/user:openshift_cluster' in row:
-                        row['resourceTags/user:openshift_cluster'] = expected_tags['openshift_cluster']
-
-                if 'openshift_node' in expected_tags:
-                    # Direct column
-                    if 'openshift_node' in row:
-                        row['openshift_node'] = expected_tags['openshift_node']
-                    # ResourceTag column
-                    if 'resourceTags/user:openshift_node' in row:
-                        row['resourceTags/user:openshift_node'] = expected_tags['openshift_node']
-
-            writer.writerow(row)
-
-    temp_path.replace(csv_path)
+    # Every column is read as a non-null string so untouched fields are written back as-is
+    table = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(column_types={col: pa.string() for col in columns}),
+    )
+
+    def overwrite(table, col, values):
+        return table.set_column(table.schema.get_field_index(col), col, values)
+
+    # Fix resource ID (empty IDs stay empty)
+    resource_ids = table[resource_col]
+    has_id = pc.not_equal(resource_ids, '')
+    table = overwrite(table, resource_col, pc.if_else(has_id, expected_id, resource_ids))
+    updated = pc.sum(has_id).as_py() or 0
+
+    # Fix OpenShift tags (for tag matching scenarios), in the direct or ResourceTag column;
+    # the (column, value) pairs present in this file are resolved once from the header
+    tag_updates = [
+        (col, expected_tags[tag])
+        for tag, tag_cols in TAG_COLUMNS.items() if tag in expected_tags
+        for col in tag_cols if col in table.column_names
+    ]
+    for col, value in tag_updates:
+        table = overwrite(table, col, pa.repeat(pa.scalar(value, pa.string()), table.num_rows))
+
+    pacsv.write_csv(table, temp_path)
+    os.replace(temp_path, csv_path)
     tag_info = f", tags={list(expected_tags.keys())}" if expected_tags else ""
     print(f"  ✓ Aligned {updated} rows in {csv_path.name} ({resource_col} -> {expected_id}{tag_info})")
 
 
+def _iter_ocp_report_csvs(root):
+    """Yield paths of *openshift_report*.csv files under root, using DirEntry types instead of stat calls."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and 'openshift_report' in entry.name \
+                        and entry.name.endswith('.csv'):
+                    yield Path(entry.path)
+
+
+def _is_pod_usage_csv(csv_file):
+    """Check if an OCP report CSV is pod usage (has resource_id column), from the raw header bytes."""
+    fd = os.open(csv_file, os.O_RDONLY)
+    try:
+        header = os.read(fd, HEADER_PEEK_SIZE).split(b'\n', 1)[0]
+    finally:
+        os.close(fd)
+    return b'resource_id' in header and b'persistentvolume' not in header
+
+
 def main():
     parser = argparse.ArgumentParser(description='Align test data with manifest')
     parser.add_argument('--manifest', required=True, help='Test manifest file')
@@ -168,6 +281,8 @@ def main():
     parser.add_argument('--aws-file', help='AWS CSV file')
     args = parser.parse_args()
 
+    if YAML_LOADER is yaml.SafeLoader:
+        print("  ⚠️  PyYAML has no libyaml support, using the pure-Python loader (pip install PyYAML[libyaml])")
     print(f"Loading manifest: {args.manifest}")
     expected = load_manifest(args.manifest)
 
@@ -176,25 +291,32 @@ def main():
     if expected['aws_tags']:
         print(f"Expected AWS tags: {expected['aws_tags']}")
 
-    # Align OCP files
+    # Each file is aligned independently, so collect them all and run them side by side
+    tasks = []
+
+    # Align OCP files: all pod usage CSVs, found recursively
     if args.ocp_dir and expected['ocp_nodes']:
         ocp_path = Path(args.ocp_dir)
         print(f"\nAligning OCP data in {ocp_path}...")
-
-        # Find all pod usage CSVs recursively
-        for csv_file in ocp_path.rglob('*openshift_report*.csv'):
-            # Check if it's pod usage (has resource_id column)
-            with open(csv_file, 'r') as f:
-                first_line = f.readline()
-                if 'resource_id' in first_line and 'persistentvolume' not in first_line:
-                    align_ocp_pod_usage(csv_file, expected['ocp_nodes'])
+        for csv_file in _iter_ocp_report_csvs(ocp_path):
+            if _is_pod_usage_csv(csv_file):
+                tasks.append((align_ocp_pod_usage, csv_file, expected['ocp_nodes']))
 
     # Align AWS file
     if args.aws_file and expected['aws_resources']:
         aws_path = Path(args.aws_file)
         if aws_path.exists():
             print(f"\nAligning AWS data in {aws_path}...")
-            align_aws_cur(aws_path, expected['aws_resources'], expected['aws_tags'])
+            tasks.append((align_aws_cur, aws_path, expected['aws_resources'], expected['aws_tags']))
+
+    if len(tasks) > 1:
+        workers = min(MAX_ALIGN_WORKERS, os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(*task) for task in tasks]:
+                future.result()
+    else:
+        for func, *task_args in tasks:
+            func(*task_args)
 
     print("\n✅ Data alignment complete")
 
@@ -5,9 +5,12 @@ Measures actual memory usage, CPU consumption, and processing time
 for different dataset sizes.
 """
 
+import copy
 import os
+import resource
 import sys
 import time
+import tracemalloc
 import psutil
 import gc
 from pathlib import Path
@@ -22,56 +25,77 @@ from src.parquet_reader import ParquetReader
 from src.aggregator_pod import PodAggregator, calculate_node_capacity
 from src.db_writer import DatabaseWriter
 
+# Aggregation engines selectable with --engine (pod labels via pandas or Arrow compute)
+ENGINES = ('pandas', 'arrow')
+
 
 class PerformanceBenchmark:
     """Benchmark POC performance with empirical measurements."""
 
-    def __init__(self, config):
+    def __init__(self, config, trace_allocations=False):
         self.config = config
         self.logger = get_logger("benchmark")
         self.process = psutil.Process(os.getpid())
         self.measurements = []
 
+        # Python heap allocations per phase (precise, but slows every allocation down)
+        self.trace_allocations = trace_allocations
+        if trace_allocations:
+            tracemalloc.start()
+
     def get_memory_usage(self):
         """Get current memory usage in bytes."""
         return self.process.memory_info().rss
 
-    def get_cpu_percent(self):
-        """Get current CPU usage percentage."""
-        return self.process.cpu_percent(interval=0.1)
+    def get_peak_memory_usage(self):
+        """Get the process's peak RSS (high-water mark) in bytes."""
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
 
-    def measure_phase(self, phase_name, func, *args, **kwargs):
+    def measure_phase(self, phase_name, func, *args, collect=False, **kwargs):
         """Measure memory and CPU for a specific phase.
 
         Args:
             phase_name: Name of the phase
             func: Function to execute
             *args, **kwargs: Arguments for the function
+            collect: Run a full garbage collection first, for a stable RSS baseline
 
         Returns:
             Tuple of (result, measurement_dict)
         """
-        # Force garbage collection before measurement
-        gc.collect()
+        if collect:
+            gc.collect()
 
         # Initial measurements
         mem_before = self.get_memory_usage()
-        cpu_before = self.process.cpu_times()
-        time_start = time.time()
-
-        # Execute function
-        result = func(*args, **kwargs)
+        cpu_before = os.times()
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            traced_before, _ = tracemalloc.get_traced_memory()
+
+        # Execute function, keeping collector pauses out of the timing
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        time_start = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            time_end = time.perf_counter_ns()
+            if gc_was_enabled:
+                gc.enable()
 
         # Final measurements
-        time_end = time.time()
-        cpu_after = self.process.cpu_times()
+        cpu_after = os.times()
         mem_after = self.get_memory_usage()
-        mem_peak = self.process.memory_info().rss  # Peak during execution
+        # Process-lifetime high-water mark (ru_maxrss), not this phase's own peak;
+        # per-phase peak allocation comes from --trace-allocations
+        mem_peak = self.get_peak_memory_usage()
 
         # Calculate metrics
-        duration = time_end - time_start
+        duration = (time_end - time_start) / 1e9
         mem_used = mem_after - mem_before
-        mem_delta = mem_peak - mem_before
         cpu_user = cpu_after.user - cpu_before.user
         cpu_system = cpu_after.system - cpu_before.system
         cpu_total = cpu_user + cpu_system
@@ -83,11 +107,14 @@ class PerformanceBenchmark:
             'memory_after_bytes': mem_after,
             'memory_used_bytes': mem_used,
             'memory_peak_bytes': mem_peak,
-            'memory_delta_bytes': mem_delta,
             'cpu_user_seconds': cpu_user,
             'cpu_system_seconds': cpu_system,
             'cpu_total_seconds': cpu_total,
         }
+        if self.trace_allocations:
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            measurement['python_alloc_delta_bytes'] = traced_after - traced_before
+            measurement['python_alloc_peak_bytes'] = traced_peak - traced_before
 
         self.measurements.append(measurement)
 
@@ -103,13 +130,28 @@ class PerformanceBenchmark:
 
         return result, measurement
 
-    def run_benchmark(self, provider_uuid, year, month):
+    def engine_config(self, engine):
+        """Copy of the config with the aggregation engine forced.
+
+        Args:
+            engine: 'pandas' or 'arrow'
+
+        Returns:
+            Configuration dictionary
+        """
+        config = copy.deepcopy(self.config)
+        config.setdefault('performance', {})['use_arrow_compute'] = engine == 'arrow'
+        return config
+
+    def run_benchmark(self, provider_uuid, year, month, engines=None, fused_read=False):
         """Run full benchmark for a specific dataset.
 
         Args:
             provider_uuid: Provider UUID
             year: Year
             month: Month
+            engines: Aggregation engines to time side by side (None = as configured)
+            fused_read: Read daily and hourly pod usage in one overlapped phase
 
         Returns:
             Dictionary with benchmark results
@@ -121,7 +163,8 @@ class PerformanceBenchmark:
         # Initialize components
         parquet_reader, _ = self.measure_phase(
             "Initialize ParquetReader",
-            lambda: ParquetReader(self.config)
+            lambda: ParquetReader(self.config),
+            collect=True
         )
 
         db_writer, _ = self.measure_phase(
@@ -141,31 +184,40 @@ class PerformanceBenchmark:
             fetch_tags
         )
 
-        # Read pod usage (daily)
-        pod_usage_daily_df, read_daily_measurement = self.measure_phase(
-            "Read pod usage (daily)",
-            parquet_reader.read_pod_usage_line_items,
-            provider_uuid=provider_uuid,
-            year=year,
-            month=month,
-            daily=True,
-            streaming=False
-        )
+        if fused_read:
+            # Both grains in one phase, their dataset scans overlapping
+            (pod_usage_daily_df, pod_usage_hourly_df), _ = self.measure_phase(
+                "Read pod usage (fused daily+hourly)",
+                parquet_reader.read_pod_usage_fused,
+                provider_uuid=provider_uuid,
+                year=year,
+                month=month
+            )
+        else:
+            # Read pod usage (daily)
+            pod_usage_daily_df, _ = self.measure_phase(
+                "Read pod usage (daily)",
+                parquet_reader.read_pod_usage_line_items,
+                provider_uuid=provider_uuid,
+                year=year,
+                month=month,
+                daily=True,
+                streaming=False
+            )
+
+            # Read pod usage (hourly) for capacity
+            pod_usage_hourly_df, _ = self.measure_phase(
+                "Read pod usage (hourly)",
+                parquet_reader.read_pod_usage_line_items,
+                provider_uuid=provider_uuid,
+                year=year,
+                month=month,
+                daily=False,
+                streaming=False
+            )
 
         daily_rows = len(pod_usage_daily_df)
         self.logger.info(f"Daily rows: {daily_rows:,}")
-
-        # Read pod usage (hourly) for capacity
-        pod_usage_hourly_df, read_hourly_measurement = self.measure_phase(
-            "Read pod usage (hourly)",
-            parquet_reader.read_pod_usage_line_items,
-            provider_uuid=provider_uuid,
-            year=year,
-            month=month,
-            daily=False,
-            streaming=False
-        )
-
         hourly_rows = len(pod_usage_hourly_df)
         self.logger.info(f"Hourly rows: {hourly_rows:,}")
 
@@ -194,18 +246,24 @@ class PerformanceBenchmark:
             pod_usage_hourly_df
         )
 
-        # Aggregate pod usage
-        aggregator = PodAggregator(self.config, enabled_tag_keys)
-
-        aggregated_df, aggregation_measurement = self.measure_phase(
-            "Aggregate pod usage",
-            aggregator.aggregate,
-            pod_usage_df=pod_usage_daily_df,
-            node_capacity_df=node_capacity_df,
-            node_labels_df=node_labels_df,
-            namespace_labels_df=namespace_labels_df,
-            cost_category_df=cost_category_df
-        )
+        # Aggregate pod usage (once per engine when comparing engines)
+        aggregation_seconds = {}
+        for i, engine in enumerate(engines or [None]):
+            config = self.engine_config(engine) if engine else self.config
+            aggregator = PodAggregator(config, enabled_tag_keys)
+
+            aggregated_df, aggregation_measurement = self.measure_phase(
+                f"Aggregate pod usage ({engine})" if engine else "Aggregate pod usage",
+                aggregator.aggregate,
+                pod_usage_df=pod_usage_daily_df,
+                node_capacity_df=node_capacity_df,
+                node_labels_df=node_labels_df,
+                namespace_labels_df=namespace_labels_df,
+                cost_category_df=cost_category_df,
+                collect=i > 0  # Stable RSS baseline between engine runs
+            )
+            if engine:
+                aggregation_seconds[engine] = aggregation_measurement['duration_seconds']
 
         output_rows = len(aggregated_df)
         self.logger.info(f"Output rows: {output_rows:,}")
@@ -238,6 +296,7 @@ class PerformanceBenchmark:
             'memory_per_1k_input_rows_bytes': memory_per_1k_input,
             'memory_per_1k_output_rows_bytes': memory_per_1k_output,
             'rows_per_second': rows_per_second,
+            'aggregation_seconds_by_engine': aggregation_seconds,
             'phases': self.measurements
         }
 
@@ -254,6 +313,8 @@ class PerformanceBenchmark:
         self.logger.info(f"Final memory: {format_bytes(final_memory)}")
         self.logger.info(f"Memory per 1K input rows: {format_bytes(int(memory_per_1k_input))}")
         self.logger.info(f"Processing rate: {rows_per_second:,.0f} rows/sec")
+        for engine, seconds in aggregation_seconds.items():
+            self.logger.info(f"Aggregation ({engine}): {seconds:.2f}s")
         self.logger.info("=" * 80)
 
         return summary
@@ -285,6 +346,21 @@ def main():
         '--output',
         help='Output JSON file for results'
     )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES + ('both',),
+        help='Aggregation engine to benchmark, or both side by side (default: as configured)'
+    )
+    parser.add_argument(
+        '--trace-allocations',
+        action='store_true',
+        help='Also report Python heap allocations per phase (tracemalloc; slows the run down)'
+    )
+    parser.add_argument(
+        '--fused-read',
+        action='store_true',
+        help='Read daily and hourly pod usage in one phase with overlapping scans'
+    )
 
     args = parser.parse_args()
 
@@ -303,8 +379,9 @@ def main():
     month = args.month or os.getenv('POC_MONTH') or config['ocp']['month']
 
     # Run benchmark
-    benchmark = PerformanceBenchmark(config)
-    results = benchmark.run_benchmark(provider_uuid, year, month)
+    benchmark = PerformanceBenchmark(config, trace_allocations=args.trace_allocations)
+    engines = list(ENGINES) if args.engine == 'both' else [args.engine] if args.engine else None
+    results = benchmark.run_benchmark(provider_uuid, year, month, engines=engines, fused_read=args.fused_read)
 
     # Save results if requested
     if args.output:
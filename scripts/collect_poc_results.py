@@ -11,13 +11,29 @@ import json
 import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     import psycopg2
+    import psycopg2.extensions
 except ImportError:
     print("❌ Error: 'psycopg2' package not installed")
     print("   Install with: pip install psycopg2-binary")
     sys.exit(1)
 
+# Namespace rows fetched per round trip from the server-side cursor
+NAMESPACE_FETCH_SIZE = 10000
+
+# NUMERIC columns cast straight to float, skipping the intermediate decimal.Decimal
+DEC2FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    'DEC2FLOAT',
+    lambda value, cursor: float(value) if value is not None else None
+)
+
 
 def connect_to_poc_db(host='localhost', port=15432, dbname='koku', user='koku', password='koku123'):
     """Connect to POC PostgreSQL database."""
@@ -29,6 +45,8 @@ def connect_to_poc_db(host='localhost', port=15432, dbname='koku', user='koku',
             user=user,
             password=password
         )
+        conn.set_session(readonly=True)
+        psycopg2.extensions.register_type(DEC2FLOAT, conn)
         return conn
     except Exception as e:
         print(f"❌ Failed to connect to POC database: {e}")
@@ -42,7 +60,10 @@ def connect_to_poc_db(host='localhost', port=15432, dbname='koku', user='koku',
 
 
 def collect_results(conn, date, schema=None, output_file=None):
-    """Collect POC results for specific date."""
+    """Collect POC results for specific date.
+
+    With output_file, namespace_breakdown is streamed into the file and left out of the returned dict.
+    """
     # Auto-detect schema from environment if not provided
     if not schema:
         import os
@@ -79,16 +100,18 @@ def collect_results(conn, date, schema=None, output_file=None):
             print(f"   Did you run the POC aggregation for this date?")
             sys.exit(1)
 
-        print(f"   ✓ {totals[0]:,} rows, ${float(totals[1]):.2f} total cost")
+        print(f"   ✓ {totals[0]:,} rows, ${totals[1]:.2f} total cost")
 
     except Exception as e:
         print(f"❌ Failed to query totals: {e}")
         sys.exit(1)
 
-    # Query 2: Per-Namespace
+    # Query 2: Per-Namespace (server-side cursor: rows arrive NAMESPACE_FETCH_SIZE at a time)
     print("2. Querying per-namespace costs...")
     try:
-        cursor.execute(f"""
+        ns_cursor = conn.cursor(name='ns_stream')
+        ns_cursor.itersize = NAMESPACE_FETCH_SIZE
+        ns_cursor.execute(f"""
             SELECT
                 namespace,
                 COALESCE(SUM(unblended_cost), 0) as namespace_cost,
@@ -98,15 +121,25 @@ def collect_results(conn, date, schema=None, output_file=None):
             FROM {table}
             WHERE usage_start = %s
             GROUP BY namespace
+            HAVING COALESCE(SUM(unblended_cost), 0) <> 0 OR COALESCE(SUM(blended_cost), 0) <> 0
             ORDER BY namespace_cost DESC
         """, (date,))
-        namespaces = cursor.fetchall()
-        print(f"   ✓ {len(namespaces)} namespaces")
 
     except Exception as e:
         print(f"❌ Failed to query namespaces: {e}")
         sys.exit(1)
 
+    namespace_breakdown = (
+        {
+            'namespace': ns[0],
+            'cost': ns[1],
+            'blended_cost': ns[2],
+            'rows': ns[3],
+            'clusters': ns[4]
+        }
+        for ns in ns_cursor
+    )
+
     # Build results
     results = {
         'date': date,
@@ -115,34 +148,29 @@ def collect_results(conn, date, schema=None, output_file=None):
         'schema': schema,
         'totals': {
             'row_count': totals[0],
-            'total_cost': float(totals[1]),
-            'total_blended_cost': float(totals[2]),
+            'total_cost': totals[1],
+            'total_blended_cost': totals[2],
             'namespaces': totals[3],
             'clusters': totals[4],
             'cluster_aliases': totals[5]
         },
-        'namespace_breakdown': [
-            {
-                'namespace': ns[0],
-                'cost': float(ns[1]),
-                'blended_cost': float(ns[2]),
-                'rows': ns[3],
-                'clusters': ns[4]
-            }
-            for ns in namespaces
-        ]
     }
 
-    # Save
+    # Save (namespace rows are streamed from the cursor into the file, never held as a list)
     if output_file:
         print(f"\n3. Saving to {output_file}...")
         try:
-            with open(output_file, 'w') as f:
-                json.dump(results, f, indent=2)
+            with open(output_file, 'wb') as f:
+                namespace_count = write_results(f, results, namespace_breakdown)
+            print(f"   ✓ {namespace_count} namespaces")
             print(f"   ✓ Results saved")
         except Exception as e:
             print(f"❌ Failed to save: {e}")
             sys.exit(1)
+    else:
+        results['namespace_breakdown'] = list(namespace_breakdown)
+        print(f"   ✓ {len(results['namespace_breakdown'])} namespaces")
+    ns_cursor.close()
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -150,7 +178,7 @@ def collect_results(conn, date, schema=None, output_file=None):
     print(f"{'=' * 60}")
     print(f"Date:       {date}")
     print(f"Rows:       {totals[0]:,}")
-    print(f"Cost:       ${float(totals[1]):,.2f}")
+    print(f"Cost:       ${totals[1]:,.2f}")
     print(f"Namespaces: {totals[3]}")
     print(f"Clusters:   {totals[4]}")
     if output_file:
@@ -163,6 +191,33 @@ def collect_results(conn, date, schema=None, output_file=None):
     return results
 
 
+def dumps_indented(obj):
+    """Serialize to 2-space indented JSON bytes (orjson when installed, else the stdlib encoder)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode()
+
+
+def write_results(f, results, namespace_breakdown):
+    """Write results as indented JSON to a binary file, streaming namespace_breakdown entries one at a time.
+
+    The output is the same as dumping results with indent=2 with the entries
+    as a trailing 'namespace_breakdown' list.
+
+    Returns:
+        Number of namespace entries written
+    """
+    head = dumps_indented(results)
+    f.write(head[:-2] + b',\n  "namespace_breakdown": [')
+    count = 0
+    for entry in namespace_breakdown:
+        f.write(b',\n    ' if count else b'\n    ')
+        f.write(dumps_indented(entry).replace(b'\n', b'\n    '))
+        count += 1
+    f.write(b'\n  ]\n}' if count else b']\n}')
+    return count
+
+
 def main():
     parser = argparse.ArgumentParser(description='Collect POC results for Trino comparison')
     parser.add_argument('--date', type=str, required=True, help='Date to collect (YYYY-MM-DD)')
@@ -10,24 +10,54 @@ Usage:
 """
 
 import argparse
+import heapq
 import json
 import sys
-from datetime import datetime
-from decimal import Decimal
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Write buffer for the markdown report
+REPORT_BUFFER_SIZE = 1 << 20
+
+# One per-namespace row of the comparison table
+NAMESPACE_ROW_TEMPLATE = "| {} | ${:.2f} | ${:.2f} | ${:.2f} | {:.2f}% | {} |\n"
+
+# Top-level keys every baseline/results file must carry
+REQUIRED_KEYS = ('totals', 'namespace_breakdown')
+
+
+def _reject_constant(name):
+    """Reject the NaN/Infinity literals the stdlib decoder accepts (orjson rejects them too)."""
+    raise ValueError(f"non-standard JSON constant {name}")
 
 
 def load_json(file_path):
-    """Load JSON file."""
+    """Load JSON file, exiting early on invalid JSON or a missing totals/namespace_breakdown."""
     try:
-        with open(file_path) as f:
-            return json.load(f)
+        if orjson is not None:
+            # orjson parses the raw bytes directly (its errors subclass json.JSONDecodeError)
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(file_path) as f:
+                data = json.load(f, parse_constant=_reject_constant)
     except FileNotFoundError:
         print(f"❌ File not found: {file_path}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"❌ Invalid JSON in {file_path}: {e}")
         sys.exit(1)
 
+    missing = [key for key in REQUIRED_KEYS if key not in data] if isinstance(data, dict) else list(REQUIRED_KEYS)
+    if missing:
+        print(f"❌ Not a results file: {file_path} (missing {', '.join(missing)})")
+        sys.exit(1)
+    return data
+
 
 def calculate_diff(trino_value, poc_value):
     """Calculate absolute and percentage difference."""
@@ -36,199 +66,231 @@ def calculate_diff(trino_value, poc_value):
     return diff, diff_pct
 
 
+def calculate_diff_vec(trino_values, poc_values):
+    """Calculate absolute and percentage differences element-wise (calculate_diff over arrays)."""
+    import numpy as np
+
+    diffs = np.abs(poc_values - trino_values)
+    diff_pcts = np.zeros_like(diffs)
+    np.divide(diffs, trino_values, out=diff_pcts, where=trino_values > 0)
+    diff_pcts *= 100
+    return diffs, diff_pcts
+
+
+def top_namespaces(results, n=10):
+    """Highest-cost namespaces: the producer's pre-sorted 'top10' when present, else a top-N selection."""
+    if n <= 10 and 'top10' in results:
+        return results['top10'][:n]
+    return heapq.nlargest(n, results['namespace_breakdown'], key=itemgetter('cost'))
+
+
 def compare(trino, poc, output_file=None, tolerance_pct=1.0):
     """Compare Trino and POC results."""
+    # Imported here so that --help and argument errors do not pay for them
+    from datetime import datetime
+    
+    import numpy as np
+    import pandas as pd
     
     print(f"\n{'=' * 80}")
     print(f"POC vs Trino Comparison")
     print(f"{'=' * 80}\n")
     
     # Extract totals
-    trino_totals = trino['totals']
-    poc_totals = poc['totals']
+    totals_keys = ('total_cost', 'total_blended_cost', 'row_count', 'namespaces', 'clusters')
+    t_cost, t_blended, t_rows, t_ns, t_clusters = (trino['totals'][key] for key in totals_keys)
+    p_cost, p_blended, p_rows, p_ns, p_clusters = (poc['totals'][key] for key in totals_keys)
     
     # Compare totals
-    cost_diff, cost_diff_pct = calculate_diff(
-        trino_totals['total_cost'],
-        poc_totals['total_cost']
-    )
+    cost_diff, cost_diff_pct = calculate_diff(t_cost, p_cost)
     
-    row_diff, row_diff_pct = calculate_diff(
-        trino_totals['row_count'],
-        poc_totals['row_count']
-    )
+    row_diff, row_diff_pct = calculate_diff(t_rows, p_rows)
     
-    ns_diff = abs(poc_totals['namespaces'] - trino_totals['namespaces'])
-    cluster_diff = abs(poc_totals['clusters'] - trino_totals['clusters'])
+    ns_diff = abs(p_ns - t_ns)
+    cluster_diff = abs(p_clusters - t_clusters)
     
     # Determine pass/fail
     passed = cost_diff_pct < tolerance_pct
     status_emoji = "✅" if passed else "❌"
     status_text = "PASS" if passed else "FAIL"
     
+    # Stream the report straight into the output file (or stdout without one)
+    report_file = None
+    if output_file:
+        try:
+            report_file = open(output_file, 'wb', buffering=REPORT_BUFFER_SIZE)
+        except Exception as e:
+            print(f"❌ Failed to save report: {e}")
+    if report_file is None:
+        sys.stdout.flush()
+    out = report_file or sys.stdout.buffer
+
+    def w(line):
+        out.write(line.encode() + b'\n')
+
     # Build report
-    report_lines = []
-    report_lines.append(f"# POC vs Trino Comparison Report")
-    report_lines.append(f"")
-    report_lines.append(f"## Summary")
-    report_lines.append(f"")
-    report_lines.append(f"**Date:** {trino['date']}  ")
-    report_lines.append(f"**Compared At:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  ")
-    report_lines.append(f"**Status:** {status_emoji} **{status_text}** (Tolerance: {tolerance_pct}%)  ")
-    report_lines.append(f"**Cost Difference:** {cost_diff_pct:.2f}%  ")
-    report_lines.append(f"")
-    report_lines.append(f"## Total Cost Comparison")
-    report_lines.append(f"")
-    report_lines.append(f"| Metric | Trino | POC | Difference | % Diff | Status |")
-    report_lines.append(f"|--------|-------|-----|------------|--------|--------|")
-    report_lines.append(
-        f"| Total Cost | ${trino_totals['total_cost']:.2f} | "
-        f"${poc_totals['total_cost']:.2f} | ${cost_diff:.2f} | "
+    w(f"# POC vs Trino Comparison Report")
+    w(f"")
+    w(f"## Summary")
+    w(f"")
+    w(f"**Date:** {trino['date']}  ")
+    w(f"**Compared At:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  ")
+    w(f"**Status:** {status_emoji} **{status_text}** (Tolerance: {tolerance_pct}%)  ")
+    w(f"**Cost Difference:** {cost_diff_pct:.2f}%  ")
+    w(f"")
+    w(f"## Total Cost Comparison")
+    w(f"")
+    w(f"| Metric | Trino | POC | Difference | % Diff | Status |")
+    w(f"|--------|-------|-----|------------|--------|--------|")
+    w(
+        f"| Total Cost | ${t_cost:.2f} | "
+        f"${p_cost:.2f} | ${cost_diff:.2f} | "
         f"{cost_diff_pct:.2f}% | {'✅' if cost_diff_pct < tolerance_pct else '❌'} |"
     )
-    report_lines.append(
-        f"| Blended Cost | ${trino_totals['total_blended_cost']:.2f} | "
-        f"${poc_totals['total_blended_cost']:.2f} | - | - | - |"
+    w(
+        f"| Blended Cost | ${t_blended:.2f} | "
+        f"${p_blended:.2f} | - | - | - |"
     )
-    report_lines.append(
-        f"| Row Count | {trino_totals['row_count']:,} | {poc_totals['row_count']:,} | "
+    w(
+        f"| Row Count | {t_rows:,} | {p_rows:,} | "
         f"{row_diff:,} | {row_diff_pct:.2f}% | {'✅' if row_diff_pct < 10 else '⚠️'} |"
     )
-    report_lines.append(
-        f"| Namespaces | {trino_totals['namespaces']} | {poc_totals['namespaces']} | "
+    w(
+        f"| Namespaces | {t_ns} | {p_ns} | "
         f"{ns_diff} | - | {'✅' if ns_diff == 0 else '⚠️'} |"
     )
-    report_lines.append(
-        f"| Clusters | {trino_totals['clusters']} | {poc_totals['clusters']} | "
+    w(
+        f"| Clusters | {t_clusters} | {p_clusters} | "
         f"{cluster_diff} | - | {'✅' if cluster_diff == 0 else '⚠️'} |"
     )
-    report_lines.append(f"")
+    w(f"")
     
     # Per-Namespace Comparison
-    report_lines.append(f"## Per-Namespace Comparison")
-    report_lines.append(f"")
-    report_lines.append(f"| Namespace | Trino Cost | POC Cost | Difference | % Diff | Status |")
-    report_lines.append(f"|-----------|------------|----------|------------|--------|--------|")
-    
-    # Build namespace dictionaries
-    trino_ns = {ns['namespace']: ns['cost'] for ns in trino['namespace_breakdown']}
-    poc_ns = {ns['namespace']: ns['cost'] for ns in poc['namespace_breakdown']}
+    w(f"## Per-Namespace Comparison")
+    w(f"")
+    w(f"| Namespace | Trino Cost | POC Cost | Difference | % Diff | Status |")
+    w(f"|-----------|------------|----------|------------|--------|--------|")
     
-    all_namespaces = sorted(set(trino_ns.keys()) | set(poc_ns.keys()))
-    
-    ns_mismatches = 0
-    for ns in all_namespaces:
-        trino_cost = trino_ns.get(ns, 0)
-        poc_cost = poc_ns.get(ns, 0)
-        
-        if trino_cost == 0 and poc_cost == 0:
-            continue  # Skip empty namespaces
-        
-        diff, diff_pct = calculate_diff(trino_cost, poc_cost)
-        
-        # Per-namespace tolerance is higher (5%)
-        ns_passed = diff_pct < 5.0
-        if not ns_passed:
-            ns_mismatches += 1
-        
-        status = "✅" if ns_passed else "⚠️"
-        
-        report_lines.append(
-            f"| {ns[:40]} | ${trino_cost:.2f} | ${poc_cost:.2f} | "
-            f"${diff:.2f} | {diff_pct:.2f}% | {status} |"
-        )
+    # Align namespaces with one outer merge (last entry wins for duplicates)
+    def breakdown(results):
+        # Explicit float dtype: an empty breakdown would otherwise give an object column
+        df = pd.DataFrame(results['namespace_breakdown'], columns=['namespace', 'cost']).astype({'cost': float})
+        return df.drop_duplicates('namespace', keep='last')
+
+    ns_costs = breakdown(trino).merge(
+        breakdown(poc), on='namespace', how='outer', suffixes=('_trino', '_poc'), sort=True
+    )
+    ns_costs[['cost_trino', 'cost_poc']] = ns_costs[['cost_trino', 'cost_poc']].fillna(0)
+    # Skip empty namespaces (current exporters leave them out already; older files may have them)
+    ns_costs = ns_costs[(ns_costs['cost_trino'] != 0) | (ns_costs['cost_poc'] != 0)]
+
+    trino_costs = ns_costs['cost_trino'].to_numpy(dtype=float)
+    poc_costs = ns_costs['cost_poc'].to_numpy(dtype=float)
+    diffs, diff_pcts = calculate_diff_vec(trino_costs, poc_costs)
+
+    # Per-namespace tolerance is higher (5%)
+    ns_ok = diff_pcts < 5.0
+    ns_mismatches = int((~ns_ok).sum())
+
+    # Rows are filled column-wise into one pre-parsed template and streamed out
+    rows = map(
+        NAMESPACE_ROW_TEMPLATE.format,
+        ns_costs['namespace'].str.slice(0, 40).tolist(),
+        trino_costs.tolist(),
+        poc_costs.tolist(),
+        diffs.tolist(),
+        diff_pcts.tolist(),
+        np.where(ns_ok, "✅", "⚠️").tolist(),
+    )
+    out.writelines(row.encode() for row in rows)
     
-    report_lines.append(f"")
+    w(f"")
     
     # Validation Status
-    report_lines.append(f"## Validation Status")
-    report_lines.append(f"")
+    w(f"## Validation Status")
+    w(f"")
     
     if passed:
-        report_lines.append(f"{status_emoji} **PASS**: POC results match Trino within {tolerance_pct}% tolerance")
-        report_lines.append(f"")
-        report_lines.append(f"### Key Metrics")
-        report_lines.append(f"- ✅ Total cost difference: {cost_diff_pct:.2f}% (< {tolerance_pct}%)")
-        report_lines.append(f"- {'✅' if row_diff_pct < 10 else '⚠️'} Row count difference: {row_diff_pct:.2f}%")
-        report_lines.append(f"- {'✅' if ns_diff == 0 else '⚠️'} Namespace count: {poc_totals['namespaces']} vs {trino_totals['namespaces']}")
-        report_lines.append(f"- {'✅' if ns_mismatches == 0 else '⚠️'} Namespace cost mismatches: {ns_mismatches}")
+        w(f"{status_emoji} **PASS**: POC results match Trino within {tolerance_pct}% tolerance")
+        w(f"")
+        w(f"### Key Metrics")
+        w(f"- ✅ Total cost difference: {cost_diff_pct:.2f}% (< {tolerance_pct}%)")
+        w(f"- {'✅' if row_diff_pct < 10 else '⚠️'} Row count difference: {row_diff_pct:.2f}%")
+        w(f"- {'✅' if ns_diff == 0 else '⚠️'} Namespace count: {p_ns} vs {t_ns}")
+        w(f"- {'✅' if ns_mismatches == 0 else '⚠️'} Namespace cost mismatches: {ns_mismatches}")
     else:
-        report_lines.append(f"{status_emoji} **FAIL**: POC results differ by {cost_diff_pct:.2f}% (> {tolerance_pct}%)")
-        report_lines.append(f"")
-        report_lines.append(f"### Issues Detected")
-        report_lines.append(f"- ❌ Total cost difference: ${cost_diff:.2f} ({cost_diff_pct:.2f}%)")
+        w(f"{status_emoji} **FAIL**: POC results differ by {cost_diff_pct:.2f}% (> {tolerance_pct}%)")
+        w(f"")
+        w(f"### Issues Detected")
+        w(f"- ❌ Total cost difference: ${cost_diff:.2f} ({cost_diff_pct:.2f}%)")
         if row_diff_pct > 10:
-            report_lines.append(f"- ⚠️  Row count difference: {row_diff:,} ({row_diff_pct:.2f}%)")
+            w(f"- ⚠️  Row count difference: {row_diff:,} ({row_diff_pct:.2f}%)")
         if ns_diff > 0:
-            report_lines.append(f"- ⚠️  Namespace count mismatch: {ns_diff}")
+            w(f"- ⚠️  Namespace count mismatch: {ns_diff}")
         if ns_mismatches > 0:
-            report_lines.append(f"- ⚠️  {ns_mismatches} namespace(s) with >5% cost difference")
+            w(f"- ⚠️  {ns_mismatches} namespace(s) with >5% cost difference")
     
-    report_lines.append(f"")
+    w(f"")
     
     # Next Steps
-    report_lines.append(f"## Next Steps")
-    report_lines.append(f"")
+    w(f"## Next Steps")
+    w(f"")
     
     if passed:
-        report_lines.append(f"1. ✅ Document this validation success")
-        report_lines.append(f"2. ✅ Run scale testing (larger date ranges)")
-        report_lines.append(f"3. ✅ Test performance benchmarks")
-        report_lines.append(f"4. ✅ Plan production rollout")
-        report_lines.append(f"5. ✅ Present results to team")
+        w(f"1. ✅ Document this validation success")
+        w(f"2. ✅ Run scale testing (larger date ranges)")
+        w(f"3. ✅ Test performance benchmarks")
+        w(f"4. ✅ Plan production rollout")
+        w(f"5. ✅ Present results to team")
     else:
-        report_lines.append(f"1. ❌ Investigate cost discrepancies")
-        report_lines.append(f"2. ❌ Check matching logic (resource_id, tags)")
-        report_lines.append(f"3. ❌ Verify cost attribution formulas")
-        report_lines.append(f"4. ❌ Compare intermediate steps (matching, attribution)")
-        report_lines.append(f"5. ❌ Re-run comparison after fixes")
+        w(f"1. ❌ Investigate cost discrepancies")
+        w(f"2. ❌ Check matching logic (resource_id, tags)")
+        w(f"3. ❌ Verify cost attribution formulas")
+        w(f"4. ❌ Compare intermediate steps (matching, attribution)")
+        w(f"5. ❌ Re-run comparison after fixes")
     
-    report_lines.append(f"")
+    w(f"")
     
     # Detailed Diagnostics
-    report_lines.append(f"## Detailed Diagnostics")
-    report_lines.append(f"")
-    report_lines.append(f"### Data Sources")
-    report_lines.append(f"")
-    report_lines.append(f"**Trino:**")
-    report_lines.append(f"- Source: {trino.get('source', 'N/A')}")
-    report_lines.append(f"- Exported: {trino.get('exported_at', 'N/A')}")
+    w(f"## Detailed Diagnostics")
+    w(f"")
+    w(f"### Data Sources")
+    w(f"")
+    w(f"**Trino:**")
+    w(f"- Source: {trino.get('source', 'N/A')}")
+    w(f"- Exported: {trino.get('exported_at', 'N/A')}")
     if 'provider_uuids' in trino and trino['provider_uuids']:
-        report_lines.append(f"- Provider UUIDs: {', '.join(trino['provider_uuids'][:2])}")
-    report_lines.append(f"")
-    report_lines.append(f"**POC:**")
-    report_lines.append(f"- Source: {poc.get('source', 'N/A')}")
-    report_lines.append(f"- Collected: {poc.get('collected_at', 'N/A')}")
-    report_lines.append(f"- Schema: {poc.get('schema', 'N/A')}")
-    report_lines.append(f"")
+        w(f"- Provider UUIDs: {', '.join(trino['provider_uuids'][:2])}")
+    w(f"")
+    w(f"**POC:**")
+    w(f"- Source: {poc.get('source', 'N/A')}")
+    w(f"- Collected: {poc.get('collected_at', 'N/A')}")
+    w(f"- Schema: {poc.get('schema', 'N/A')}")
+    w(f"")
     
     # Top Cost Namespaces
-    report_lines.append(f"### Top 10 Cost Namespaces")
-    report_lines.append(f"")
-    report_lines.append(f"**Trino:**")
-    for ns in trino['namespace_breakdown'][:10]:
-        report_lines.append(f"- {ns['namespace']}: ${ns['cost']:.2f}")
-    report_lines.append(f"")
-    report_lines.append(f"**POC:**")
-    for ns in poc['namespace_breakdown'][:10]:
-        report_lines.append(f"- {ns['namespace']}: ${ns['cost']:.2f}")
-    report_lines.append(f"")
+    w(f"### Top 10 Cost Namespaces")
+    w(f"")
+    w(f"**Trino:**")
+    for ns in top_namespaces(trino):
+        w(f"- {ns['namespace']}: ${ns['cost']:.2f}")
+    w(f"")
+    w(f"**POC:**")
+    for ns in top_namespaces(poc):
+        w(f"- {ns['namespace']}: ${ns['cost']:.2f}")
     
-    report = "\n".join(report_lines)
+    if report_file is None:
+        out.flush()
+        return passed
     
-    # Print to console
-    print(report)
+    report_file.close()
     
-    # Save to file
-    if output_file:
-        try:
-            with open(output_file, 'w') as f:
-                f.write(report)
-            print(f"\n{'=' * 80}")
-            print(f"✓ Comparison report saved to: {output_file}")
-            print(f"{'=' * 80}\n")
-        except Exception as e:
-            print(f"❌ Failed to save report: {e}")
+    # The full report is in the file; the console gets the verdict only
+    print(f"{status_emoji} {status_text}: cost difference {cost_diff_pct:.2f}% (tolerance {tolerance_pct}%), "
+          f"{ns_mismatches} namespace(s) with >5% cost difference")
+    print(f"\n{'=' * 80}")
+    print(f"✓ Comparison report saved to: {output_file}")
+    print(f"{'=' * 80}\n")
     
     return passed
 
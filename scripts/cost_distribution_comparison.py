@@ -13,8 +13,18 @@ Usage:
 import argparse
 import pandas as pd
 import numpy as np
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from typing import Dict, Tuple, List
 
+# Usage and capacity columns summed per namespace in the parquet path
+USAGE_COLUMNS = [
+    'pod_usage_cpu_core_hours',
+    'node_capacity_cpu_core_hours',
+    'pod_usage_memory_gigabyte_hours',
+    'node_capacity_memory_gigabyte_hours',
+]
+
 
 def calculate_attribution_ratios(
     cpu_usage: float,
@@ -116,26 +126,79 @@ def analyze_workload(
     }
 
 
+def analyze_workloads(
+    names: List[str],
+    cpu_pcts: np.ndarray,
+    memory_pcts: np.ndarray,
+    aws_cost: float = 100.0,
+    cpu_weight: float = 0.73,
+    memory_weight: float = 0.27
+) -> List[Dict]:
+    """
+    Analyze cost distribution for many workloads at once (vectorized analyze_workload).
+
+    Args:
+        names: Workload names
+        cpu_pcts: CPU usage as fraction of capacity (0-1), one per workload
+        memory_pcts: Memory usage as fraction of capacity (0-1), one per workload
+        aws_cost: AWS cost to distribute (default: $100 for easy %)
+        cpu_weight: CPU weight for weighted method
+        memory_weight: Memory weight for weighted method
+
+    Returns:
+        List of analysis dictionaries, as returned by analyze_workload
+    """
+    ratios = {
+        'cpu': cpu_pcts,
+        'memory': memory_pcts,
+        'weighted': cpu_pcts * cpu_weight + memory_pcts * memory_weight,
+        'max': np.maximum(cpu_pcts, memory_pcts),
+    }
+    costs = {method: aws_cost * ratio for method, ratio in ratios.items()}
+
+    # Calculate changes from CPU-only (Trino default); a change from $0 is 0 or infinite
+    from_cost = costs['cpu']
+    changes = {}
+    for method in ['memory', 'weighted', 'max']:
+        to_cost = costs[method]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_change = (to_cost - from_cost) / from_cost * 100
+        changes[f'cpu_to_{method}'] = np.where(
+            from_cost > 0, pct_change, np.where(to_cost == 0, 0.0, np.inf)
+        ).tolist()
+
+    ratios = {method: ratio.tolist() for method, ratio in ratios.items()}
+    costs = {method: cost.tolist() for method, cost in costs.items()}
+
+    return [
+        {
+            'name': name,
+            'cpu_pct': ratios['cpu'][i],
+            'memory_pct': ratios['memory'][i],
+            'ratios': {method: ratio[i] for method, ratio in ratios.items()},
+            'costs': {method: cost[i] for method, cost in costs.items()},
+            'changes': {key: change[i] for key, change in changes.items()}
+        }
+        for i, name in enumerate(names)
+    ]
+
+
 def simple_table(headers: List[str], rows: List[List[str]]) -> str:
     """Simple table formatter without external dependencies."""
-    # Calculate column widths
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            widths[i] = max(widths[i], len(str(cell)))
+    rows = [list(map(str, row)) for row in rows]
 
-    # Build table
-    lines = []
+    # Calculate column widths (column-wise max over the transposed rows)
+    widths = [len(h) for h in headers]
+    for i, column in enumerate(zip(*rows)):
+        widths[i] = max(widths[i], *map(len, column))
 
-    # Header
-    header_line = "  ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
-    lines.append(header_line)
-    lines.append("-" * len(header_line))
+    # One format string for every line, parsed once
+    fmt = "  ".join(f"{{:<{width}}}" for width in widths)
 
-    # Rows
-    for row in rows:
-        row_line = "  ".join(str(cell).ljust(widths[i]) for i, cell in enumerate(row))
-        lines.append(row_line)
+    # Build table
+    header_line = fmt.format(*headers)
+    lines = [header_line, "-" * len(header_line)]
+    lines.extend(fmt.format(*row) for row in rows)
 
     return "\n".join(lines)
 
@@ -232,28 +295,34 @@ def main():
     else:
         # Load from parquet file
         print(f"Loading data from {args.input}...")
-        df = pd.read_parquet(args.input)
-
-        # Aggregate by namespace
-        if 'namespace' in df.columns:
-            grouped = df.groupby('namespace').agg({
-                'pod_usage_cpu_core_hours': 'sum',
-                'node_capacity_cpu_core_hours': 'sum',
-                'pod_usage_memory_gigabyte_hours': 'sum',
-                'node_capacity_memory_gigabyte_hours': 'sum',
-            }).reset_index()
-
-            analyses = []
-            for _, row in grouped.iterrows():
-                cpu_pct = row['pod_usage_cpu_core_hours'] / row['node_capacity_cpu_core_hours'] if row['node_capacity_cpu_core_hours'] > 0 else 0
-                mem_pct = row['pod_usage_memory_gigabyte_hours'] / row['node_capacity_memory_gigabyte_hours'] if row['node_capacity_memory_gigabyte_hours'] > 0 else 0
-
-                analyses.append(analyze_workload(
-                    row['namespace'],
-                    min(cpu_pct, 1.0),
-                    min(mem_pct, 1.0),
-                    args.aws_cost
-                ))
+
+        # Aggregate by namespace (ParquetDataset also reads the schema of partitioned directories)
+        if 'namespace' in pq.ParquetDataset(args.input).schema.names:
+            # Only the grouped columns are decoded, and rows without a namespace are skipped in Arrow
+            df = pd.read_parquet(
+                args.input,
+                columns=['namespace', *USAGE_COLUMNS],
+                filters=pc.field('namespace').is_valid(),
+                engine='pyarrow',
+                dtype_backend='pyarrow',
+            )
+            grouped = df.groupby('namespace', observed=True).agg(
+                {col: 'sum' for col in USAGE_COLUMNS}
+            ).reset_index()
+
+            # Usage / capacity per namespace, capped at 1 (0 where there is no capacity)
+            def usage_fraction(usage, capacity):
+                usage = grouped[usage].to_numpy(dtype=float)
+                capacity = grouped[capacity].to_numpy(dtype=float)
+                fraction = np.divide(usage, capacity, out=np.zeros_like(usage), where=capacity > 0)
+                return np.minimum(fraction, 1.0)
+
+            analyses = analyze_workloads(
+                grouped['namespace'].tolist(),
+                usage_fraction('pod_usage_cpu_core_hours', 'node_capacity_cpu_core_hours'),
+                usage_fraction('pod_usage_memory_gigabyte_hours', 'node_capacity_memory_gigabyte_hours'),
+                args.aws_cost
+            )
 
             print_comparison_table(analyses, args.aws_cost)
         else:
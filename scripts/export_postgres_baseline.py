@@ -8,20 +8,48 @@ Usage:
     
     # Export specific date
     python scripts/export_postgres_baseline.py --date 2025-10-15 --output baselines/postgres_baseline.json
+    
+    # Export several dates in parallel
+    python scripts/export_postgres_baseline.py --date 2025-10-14 --date 2025-10-15 \
+        --output 'baselines/postgres_baseline_{date}.json'
 """
 
 import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     import psycopg2
+    from psycopg2.extras import RealDictCursor
 except ImportError:
     print("❌ Error: 'psycopg2' package not installed")
     print("   Install with: pip install psycopg2-binary")
     sys.exit(1)
 
+# Namespace rows fetched per round trip from the server-side cursor
+NAMESPACE_FETCH_SIZE = 10000
+
+# Upper bound on dates (and connections) exported concurrently
+MAX_EXPORT_WORKERS = 8
+
+# Decimal places kept for exported costs, so the same NUMERIC always serializes to the same JSON number
+COST_DECIMAL_PLACES = 6
+
+
+def json_default(value):
+    """Serialize NUMERIC costs, kept as exact Decimals until now, rounded to COST_DECIMAL_PLACES."""
+    if isinstance(value, Decimal):
+        return round(float(value), COST_DECIMAL_PLACES)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 def connect_to_postgres(host='localhost', port=5432, dbname='postgres', user='koku', password='koku'):
     """Connect to production PostgreSQL."""
@@ -33,6 +61,8 @@ def connect_to_postgres(host='localhost', port=5432, dbname='postgres', user='ko
             user=user,
             password=password
         )
+        # Export only reads
+        conn.set_session(readonly=True)
         print(f"✓ Connected to PostgreSQL (host={host}, port={port}, dbname={dbname})")
         return conn
     except Exception as e:
@@ -94,82 +124,75 @@ def list_dates(conn, schema, start_date, end_date):
 
 def export_date(conn, schema, date, output_file):
     """Export production PostgreSQL data for specific date."""
-    cursor = conn.cursor()
-    
     table = f"{schema}.reporting_ocpawscostlineitem_project_daily_summary_p"
     
     print(f"\n📊 Exporting production baseline for {date}...")
     print(f"   Table: {table}\n")
     
-    # Query 1: Totals
-    print("1. Querying totals...")
+    # One scan of the partition: the () grouping set is the totals row (is_total = 1, sorted
+    # first), the (namespace) set gives the per-namespace rows by cost, leaving out namespaces
+    # without any cost. Rows stream from a server-side cursor NAMESPACE_FETCH_SIZE at a time.
+    print("1. Querying totals, per-namespace costs and source UUID...")
     try:
+        cursor = conn.cursor(name='baseline_export', cursor_factory=RealDictCursor)
+        cursor.itersize = NAMESPACE_FETCH_SIZE
         cursor.execute(f"""
             SELECT 
+                GROUPING(namespace) as is_total,
+                namespace,
                 COUNT(*) as row_count,
-                COALESCE(SUM(unblended_cost), 0) as total_cost,
-                COALESCE(SUM(blended_cost), 0) as total_blended_cost,
+                COALESCE(SUM(unblended_cost), 0) as cost,
+                COALESCE(SUM(blended_cost), 0) as blended_cost,
                 COUNT(DISTINCT namespace) as namespaces,
                 COUNT(DISTINCT cluster_id) as clusters,
-                COUNT(DISTINCT cluster_alias) as cluster_aliases
+                COUNT(DISTINCT cluster_alias) as cluster_aliases,
+                MIN(source_uuid::text) as source_uuid
             FROM {table}
             WHERE usage_start = %s
+            GROUP BY GROUPING SETS ((), (namespace))
+            HAVING GROUPING(namespace) = 1
+                OR COALESCE(SUM(unblended_cost), 0) <> 0
+                OR COALESCE(SUM(blended_cost), 0) <> 0
+            ORDER BY is_total DESC, cost DESC
         """, (date,))
-        totals = cursor.fetchone()
+        rows = iter(cursor)
         
+        total = next(rows)
+        totals = (
+            total['row_count'],
+            total['cost'],
+            total['blended_cost'],
+            total['namespaces'],
+            total['clusters'],
+            total['cluster_aliases'],
+        )
         if totals[0] == 0:
             print(f"❌ No data found for date {date}")
             sys.exit(1)
+        print(f"   ✓ {totals[0]:,} rows, ${totals[1]:.2f} total cost")
         
-        print(f"   ✓ {totals[0]:,} rows, ${float(totals[1]):.2f} total cost")
-        
-    except Exception as e:
-        print(f"❌ Failed to query totals: {e}")
-        sys.exit(1)
-    
-    # Query 2: Per-Namespace
-    print("2. Querying per-namespace costs...")
-    try:
-        cursor.execute(f"""
-            SELECT 
-                namespace,
-                COALESCE(SUM(unblended_cost), 0) as namespace_cost,
-                COALESCE(SUM(blended_cost), 0) as namespace_blended_cost,
-                COUNT(*) as namespace_rows,
-                COUNT(DISTINCT cluster_id) as namespace_clusters
-            FROM {table}
-            WHERE usage_start = %s
-            GROUP BY namespace
-            ORDER BY namespace_cost DESC
-        """, (date,))
-        namespaces = cursor.fetchall()
-        print(f"   ✓ {len(namespaces)} namespaces")
-        
-    except Exception as e:
-        print(f"❌ Failed to query namespaces: {e}")
-        sys.exit(1)
-    
-    # Query 3: Provider UUIDs
-    print("3. Querying provider UUIDs...")
-    try:
-        cursor.execute(f"""
-            SELECT DISTINCT 
-                source_uuid
-            FROM {table}
-            WHERE usage_start = %s
-            LIMIT 1
-        """, (date,))
-        row = cursor.fetchone()
-        if row:
-            source_uuid = str(row[0])
+        source_uuid = total['source_uuid']
+        if source_uuid:
             print(f"   ✓ Source UUID: {source_uuid}")
         else:
-            source_uuid = None
             print(f"   ⚠️  No source UUID found")
         
+        namespace_breakdown = [
+            {
+                'namespace': ns['namespace'],
+                'cost': ns['cost'],
+                'blended_cost': ns['blended_cost'],
+                'rows': ns['row_count'],
+                'clusters': ns['clusters']
+            }
+            for ns in rows
+        ]
+        cursor.close()
+        print(f"   ✓ {len(namespace_breakdown)} namespaces")
+        
     except Exception as e:
-        print(f"⚠️  Failed to query source UUID: {e}")
-        source_uuid = None
+        print(f"❌ Failed to query baseline: {e}")
+        sys.exit(1)
     
     # Build baseline
     baseline = {
@@ -180,29 +203,26 @@ def export_date(conn, schema, date, output_file):
         'source_uuid': source_uuid,
         'totals': {
             'row_count': totals[0],
-            'total_cost': float(totals[1]),
-            'total_blended_cost': float(totals[2]),
+            'total_cost': totals[1],
+            'total_blended_cost': totals[2],
             'namespaces': totals[3],
             'clusters': totals[4],
             'cluster_aliases': totals[5]
         },
-        'namespace_breakdown': [
-            {
-                'namespace': ns[0],
-                'cost': float(ns[1]),
-                'blended_cost': float(ns[2]),
-                'rows': ns[3],
-                'clusters': ns[4]
-            }
-            for ns in namespaces
-        ]
+        'namespace_breakdown': namespace_breakdown,
+        # Namespace rows arrive ORDER BY cost DESC, so the head is the server-side top-N
+        'top10': namespace_breakdown[:10]
     }
     
     # Save
-    print(f"\n4. Saving to {output_file}...")
+    print(f"\n2. Saving to {output_file}...")
     try:
-        with open(output_file, 'w') as f:
-            json.dump(baseline, f, indent=2)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(baseline, default=json_default, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(baseline, f, indent=2, default=json_default)
         print(f"   ✓ Baseline saved")
     except Exception as e:
         print(f"❌ Failed to save: {e}")
@@ -214,7 +234,7 @@ def export_date(conn, schema, date, output_file):
     print(f"{'=' * 60}")
     print(f"Date:       {date}")
     print(f"Rows:       {totals[0]:,}")
-    print(f"Cost:       ${float(totals[1]):,.2f}")
+    print(f"Cost:       ${totals[1]:,.2f}")
     print(f"Namespaces: {totals[3]}")
     print(f"Clusters:   {totals[4]}")
     print(f"Output:     {output_file}")
@@ -232,8 +252,10 @@ def main():
     parser.add_argument('--list-dates', action='store_true', help='List available dates')
     parser.add_argument('--start', type=str, help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end', type=str, help='End date (YYYY-MM-DD)')
-    parser.add_argument('--date', type=str, help='Specific date to export (YYYY-MM-DD)')
-    parser.add_argument('--output', type=str, help='Output JSON file')
+    parser.add_argument('--date', type=str, action='append',
+                        help='Specific date to export (YYYY-MM-DD); repeat to export several dates in parallel')
+    parser.add_argument('--output', type=str,
+                        help='Output JSON file (must contain {date} when exporting several dates)')
     parser.add_argument('--host', type=str, default='localhost', help='PostgreSQL host (default: localhost)')
     parser.add_argument('--port', type=int, default=5432, help='PostgreSQL port (default: 5432)')
     parser.add_argument('--dbname', type=str, default='postgres', help='Database name (default: postgres)')
@@ -253,26 +275,41 @@ def main():
         org_id = os.getenv('ORG_ID', '1234567')
         schema = org_id if org_id.startswith('org') else f'org{org_id}'
     
-    # Connect to production PostgreSQL
-    conn = connect_to_postgres(args.host, args.port, args.dbname, args.user, args.password)
+    def connect():
+        return connect_to_postgres(args.host, args.port, args.dbname, args.user, args.password)
     
     if args.list_dates:
         if not args.start or not args.end:
             print("❌ Error: --start and --end required for --list-dates")
             sys.exit(1)
+        conn = connect()
         list_dates(conn, schema, args.start, args.end)
+        conn.close()
     
     elif args.date:
         if not args.output:
             print("❌ Error: --output required for date export")
             sys.exit(1)
-        export_date(conn, schema, args.date, args.output)
+        if len(args.date) > 1 and '{date}' not in args.output:
+            print("❌ Error: --output must contain {date} when exporting several dates")
+            sys.exit(1)
+        
+        def export(date):
+            # psycopg2 connections must not be shared between threads: one per export
+            conn = connect()
+            try:
+                export_date(conn, schema, date, args.output.replace('{date}', date))
+            finally:
+                conn.close()
+        
+        # Exports mostly wait on PostgreSQL, so dates run concurrently on their own connections
+        with ThreadPoolExecutor(max_workers=min(MAX_EXPORT_WORKERS, len(args.date))) as executor:
+            for future in [executor.submit(export, date) for date in args.date]:
+                future.result()
     
     else:
         parser.print_help()
         sys.exit(1)
-    
-    conn.close()
 
 
 if __name__ == '__main__':
@@ -8,26 +8,96 @@ Usage:
 
     # Export specific date
     python scripts/export_trino_baseline.py --date 2025-10-15 --output baselines/trino_baseline_2025-10-15.json
+
+    # Export several dates concurrently
+    python scripts/export_trino_baseline.py --date 2025-10-15 --date 2025-10-16 --output baselines/trino_baseline_{date}.json
 """
 
 import argparse
 import json
+import os
+import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
+    import requests
     import trino
 except ImportError:
     print("❌ Error: 'trino' package not installed")
     print("   Install with: pip install trino")
     sys.exit(1)
 
+# Rows fetched per request while streaming query results
+NAMESPACE_FETCH_SIZE = 5000
+
+# `oc whoami` answer cached across runs, reused for up to OC_USER_CACHE_TTL seconds
+OC_USER_CACHE = Path.home() / '.cache' / 'poc-parquet-aggregator' / 'oc_user'
+OC_USER_CACHE_TTL = 3600
+
+# Pooled keep-alive HTTP connections reused by every query on a Trino connection
+TRINO_POOL_CONNECTIONS = 4
+TRINO_POOL_MAXSIZE = 8
+TRINO_CONNECT_RETRIES = 3
+
+# Upper bound on dates exported concurrently (each on its own cursor, within TRINO_POOL_MAXSIZE)
+MAX_EXPORT_WORKERS = 8
+
+# Decimal places kept for exported costs, so the same DECIMAL always serializes to the same JSON number
+COST_DECIMAL_PLACES = 6
+
+
+def cached_oc_whoami():
+    """Return the current `oc whoami` user, from the on-disk cache while it is fresh.
+
+    Returns None when `oc whoami` fails; raises if `oc` cannot be run at all.
+    """
+    try:
+        if OC_USER_CACHE.stat().st_mtime > time.time() - OC_USER_CACHE_TTL:
+            user = OC_USER_CACHE.read_text().strip()
+            if user:
+                return user
+    except OSError:
+        pass
+
+    result = subprocess.run(['oc', 'whoami'], capture_output=True, text=True, timeout=5)
+    if result.returncode != 0:
+        return None
+    user = result.stdout.strip()
+
+    # The cache is best-effort: an unwritable home just means asking oc again next time
+    try:
+        OC_USER_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        OC_USER_CACHE.write_text(user)
+    except OSError:
+        pass
+    return user
+
+
+def trino_http_session():
+    """Create the HTTP session for a Trino connection, with a keep-alive pool and connect retries."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=TRINO_POOL_CONNECTIONS,
+        pool_maxsize=TRINO_POOL_MAXSIZE,
+        max_retries=TRINO_CONNECT_RETRIES
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 
 def connect_to_trino(host='localhost', port=8080, catalog='postgres', schema=None, user=None):
     """Connect to Trino (queries PostgreSQL tables via Trino)."""
-    import os
-    
     # Auto-detect schema from environment if not provided
     if not schema:
         org_id = os.getenv('ORG_ID', 'org1234567')
@@ -36,10 +106,7 @@ def connect_to_trino(host='localhost', port=8080, catalog='postgres', schema=Non
     # Auto-detect user from oc whoami if not provided
     if not user:
         try:
-            import subprocess
-            result = subprocess.run(['oc', 'whoami'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                user = result.stdout.strip()
+            user = cached_oc_whoami()
         except:
             user = 'admin'  # Fallback
     
@@ -50,7 +117,8 @@ def connect_to_trino(host='localhost', port=8080, catalog='postgres', schema=Non
             user=user,
             catalog=catalog,  # Use 'postgres' catalog to query PostgreSQL tables
             schema=schema,
-            http_scheme='http'
+            http_scheme='http',
+            http_session=trino_http_session()
         )
         print(f"✓ Connected to Trino (user={user}, catalog={catalog}, schema={schema})")
         return conn
@@ -61,11 +129,58 @@ def connect_to_trino(host='localhost', port=8080, catalog='postgres', schema=Non
         sys.exit(1)
 
 
+def json_default(value):
+    """Serialize DECIMAL costs, kept as exact Decimals until now, rounded to COST_DECIMAL_PLACES."""
+    if isinstance(value, Decimal):
+        return round(float(value), COST_DECIMAL_PLACES)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_indented(value):
+    """Serialize value as 2-space indented JSON text, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2, default=json_default)
+
+
+def iter_rows(cursor):
+    """Yield the rows of an executed query, fetched cursor.arraysize at a time."""
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            return
+        yield from rows
+
+
+def write_baseline(f, baseline, namespace_breakdown):
+    """Write a baseline as indented JSON, streaming namespace_breakdown entries one at a time.
+
+    The output is the same as json.dump(baseline, f, indent=2) with the entries as a
+    trailing 'namespace_breakdown' list, followed by 'top10' (its first ten entries).
+
+    Returns:
+        Number of namespace entries written
+    """
+    f.write(dumps_indented(baseline)[:-2] + ',\n  "namespace_breakdown": [')
+    top10 = []
+    count = 0
+    for entry in namespace_breakdown:
+        f.write(',\n    ' if count else '\n    ')
+        f.write(dumps_indented(entry).replace('\n', '\n    '))
+        # Rows arrive ORDER BY cost DESC, so the head is the server-side top-N
+        if count < 10:
+            top10.append(entry)
+        count += 1
+    f.write('\n  ],\n' if count else '],\n')
+    f.write('  "top10": ' + dumps_indented(top10).replace('\n', '\n  ') + '\n}')
+    return count
+
+
 def list_dates(conn, start_date, end_date):
     """List dates with OCP-AWS data."""
     cursor = conn.cursor()
 
-    query = f"""
+    query = """
     SELECT 
         usage_start,
         COUNT(*) as row_count,
@@ -73,8 +188,8 @@ def list_dates(conn, start_date, end_date):
         COUNT(DISTINCT namespace) as namespaces,
         COUNT(DISTINCT cluster_id) as clusters
     FROM reporting_ocpawscostlineitem_project_daily_summary_p
-    WHERE usage_start >= DATE '{start_date}'
-      AND usage_start <= DATE '{end_date}'
+    WHERE usage_start >= CAST(? AS DATE)
+      AND usage_start <= CAST(? AS DATE)
     GROUP BY usage_start
     ORDER BY usage_start DESC
     """
@@ -82,17 +197,15 @@ def list_dates(conn, start_date, end_date):
     print(f"\n🔍 Querying Trino for dates {start_date} to {end_date}...\n")
 
     try:
-        cursor.execute(query)
-        results = cursor.fetchall()
-
-        if not results:
-            print(f"❌ No data found for date range {start_date} to {end_date}")
-            return
-
-        print(f"{'Date':<12} {'Rows':>10} {'Cost':>15} {'NS':>5} {'Clusters':>8}")
-        print("-" * 60)
-
-        for row in results:
+        cursor.arraysize = NAMESPACE_FETCH_SIZE
+        cursor.execute(query, (start_date, end_date))
+        results = 0
+
+        for row in iter_rows(cursor):
+            if not results:
+                print(f"{'Date':<12} {'Rows':>10} {'Cost':>15} {'NS':>5} {'Clusters':>8}")
+                print("-" * 60)
+            results += 1
             date = row[0]
             row_count = row[1]
             cost = row[2] or 0
@@ -100,7 +213,11 @@ def list_dates(conn, start_date, end_date):
             clusters = row[4]
             print(f"{date!s:<12} {row_count:>10,} ${cost:>14,.2f} {namespaces:>5} {clusters:>8}")
 
-        print(f"\n✓ Found {len(results)} dates with data")
+        if not results:
+            print(f"❌ No data found for date range {start_date} to {end_date}")
+            return
+
+        print(f"\n✓ Found {results} dates with data")
         print(f"\nPick a date with good volume (1000+ rows, $100+ cost)")
 
     except Exception as e:
@@ -109,90 +226,63 @@ def list_dates(conn, start_date, end_date):
 
 
 def export_date(conn, date, output_file):
-    """Export Trino data for specific date."""
+    """Export Trino data for specific date.
+
+    namespace_breakdown is streamed into output_file and left out of the returned dict.
+    """
     cursor = conn.cursor()
 
     print(f"\n📊 Exporting Trino baseline for {date}...\n")
 
-    # Query 1: Totals
-    print("1. Querying totals...")
+    # One query, one scan: the () grouping set is the totals row (is_total = 1, sorted first,
+    # also carrying the provider UUIDs), the (namespace) set gives the per-namespace rows by cost
+    print("1. Querying totals, provider UUIDs and per-namespace costs...")
     try:
-        cursor.execute(f"""
-            SELECT 
+        cursor.arraysize = NAMESPACE_FETCH_SIZE
+        cursor.execute("""
+            SELECT
+                GROUPING(namespace) as is_total,
+                namespace,
                 COUNT(*) as row_count,
-                SUM(unblended_cost) as total_cost,
-                SUM(blended_cost) as total_blended_cost,
+                SUM(unblended_cost) as cost,
+                SUM(blended_cost) as blended_cost,
                 COUNT(DISTINCT namespace) as namespaces,
                 COUNT(DISTINCT cluster_id) as clusters,
-                COUNT(DISTINCT cluster_alias) as cluster_aliases
+                COUNT(DISTINCT cluster_alias) as cluster_aliases,
+                MIN(source) as aws_provider_uuid,
+                MIN_BY(ocp_source, source) as ocp_provider_uuid
             FROM managed_reporting_ocpawscostlineitem_project_daily_summary
-            WHERE usage_start = DATE '{date}'
-        """)
-        totals = cursor.fetchone()
-
+            WHERE usage_start = CAST(? AS DATE)
+            GROUP BY GROUPING SETS ((), (namespace))
+            HAVING GROUPING(namespace) = 1
+                OR COALESCE(SUM(unblended_cost), 0) <> 0
+                OR COALESCE(SUM(blended_cost), 0) <> 0
+            ORDER BY is_total DESC, cost DESC
+        """, (date,))
+        rows = iter_rows(cursor)
+
+        total = next(rows)
+        totals = total[2:8]
         if totals[0] == 0:
             print(f"❌ No data found for date {date}")
             sys.exit(1)
 
         print(f"   ✓ {totals[0]:,} rows, ${totals[1] or 0:.2f} total cost")
 
-    except Exception as e:
-        print(f"❌ Failed to query totals: {e}")
-        sys.exit(1)
-
-    # Query 2: Per-Namespace
-    print("2. Querying per-namespace costs...")
-    try:
-        cursor.execute(f"""
-            SELECT 
-                namespace,
-                SUM(unblended_cost) as namespace_cost,
-                SUM(blended_cost) as namespace_blended_cost,
-                COUNT(*) as namespace_rows,
-                COUNT(DISTINCT cluster_id) as namespace_clusters
-            FROM managed_reporting_ocpawscostlineitem_project_daily_summary
-            WHERE usage_start = DATE '{date}'
-            GROUP BY namespace
-            ORDER BY namespace_cost DESC
-        """)
-        namespaces = cursor.fetchall()
-        print(f"   ✓ {len(namespaces)} namespaces")
+        aws_provider_uuid, ocp_provider_uuid = total[8], total[9]
+        provider_uuids = {
+            'aws': aws_provider_uuid,
+            'ocp': ocp_provider_uuid
+        }
+        print(f"   ✓ Found provider UUIDs:")
+        print(f"     AWS: {aws_provider_uuid}")
+        print(f"     OCP: {ocp_provider_uuid}")
 
     except Exception as e:
-        print(f"❌ Failed to query namespaces: {e}")
+        print(f"❌ Failed to query totals: {e}")
         sys.exit(1)
 
-    # Query 3: Provider UUIDs (for POC to use)
-    print("3. Querying provider UUIDs...")
-    try:
-        cursor.execute(f"""
-            SELECT DISTINCT 
-                source,
-                ocp_source
-            FROM managed_reporting_ocpawscostlineitem_project_daily_summary
-            WHERE usage_start = DATE '{date}'
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
-        if row:
-            aws_provider_uuid = row[0]
-            ocp_provider_uuid = row[1]
-            provider_uuids = {
-                'aws': aws_provider_uuid,
-                'ocp': ocp_provider_uuid
-            }
-            print(f"   ✓ Found provider UUIDs:")
-            print(f"     AWS: {aws_provider_uuid}")
-            print(f"     OCP: {ocp_provider_uuid}")
-        else:
-            provider_uuids = {}
-            print(f"   ⚠️  No provider UUIDs found")
-        
-    except Exception as e:
-        print(f"⚠️  Failed to query provider UUIDs: {e}")
-        provider_uuids = {}
-
-    # Build baseline
+    # Build baseline (namespace_breakdown is streamed into the file below)
     baseline = {
         'date': date,
         'exported_at': datetime.now().isoformat(),
@@ -200,32 +290,34 @@ def export_date(conn, date, output_file):
         'provider_uuids': provider_uuids,
         'totals': {
             'row_count': totals[0],
-            'total_cost': float(totals[1] or 0),
-            'total_blended_cost': float(totals[2] or 0),
+            'total_cost': totals[1] or 0,
+            'total_blended_cost': totals[2] or 0,
             'namespaces': totals[3],
             'clusters': totals[4],
             'cluster_aliases': totals[5]
         },
-        'namespace_breakdown': [
-            {
-                'namespace': ns[0],
-                'cost': float(ns[1] or 0),
-                'blended_cost': float(ns[2] or 0),
-                'rows': ns[3],
-                'clusters': ns[4]
-            }
-            for ns in namespaces
-        ]
     }
 
-    # Save
-    print(f"\n4. Saving to {output_file}...")
+    # The remaining (namespace) rows are written to the file batch by batch as they arrive
+    print(f"2. Saving per-namespace costs to {output_file}...")
     try:
+        namespace_breakdown = (
+            {
+                'namespace': ns[1],
+                'cost': ns[3] or 0,
+                'blended_cost': ns[4] or 0,
+                'rows': ns[2],
+                'clusters': ns[6]
+            }
+            for ns in rows
+        )
         with open(output_file, 'w') as f:
-            json.dump(baseline, f, indent=2)
+            namespace_count = write_baseline(f, baseline, namespace_breakdown)
+        print(f"   ✓ {namespace_count} namespaces")
         print(f"   ✓ Baseline saved")
+
     except Exception as e:
-        print(f"❌ Failed to save: {e}")
+        print(f"❌ Failed to export namespaces: {e}")
         sys.exit(1)
 
     # Summary
@@ -255,8 +347,10 @@ def main():
     parser.add_argument('--list-dates', action='store_true', help='List available dates')
     parser.add_argument('--start', type=str, help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end', type=str, help='End date (YYYY-MM-DD)')
-    parser.add_argument('--date', type=str, help='Specific date to export (YYYY-MM-DD)')
-    parser.add_argument('--output', type=str, help='Output JSON file')
+    parser.add_argument('--date', type=str, action='append',
+                        help='Specific date to export (YYYY-MM-DD); repeat to export several dates in parallel')
+    parser.add_argument('--output', type=str,
+                        help='Output JSON file (must contain {date} when exporting several dates)')
     parser.add_argument('--host', type=str, default='localhost', help='Trino host (default: localhost)')
     parser.add_argument('--port', type=int, default=8080, help='Trino port (default: 8080)')
     parser.add_argument('--user', type=str, help='Trino user (default: from "oc whoami" or "admin")')
@@ -285,7 +379,17 @@ def main():
         if not args.output:
             print("❌ Error: --output required for date export")
             sys.exit(1)
-        export_date(conn, args.date, args.output)
+        if len(args.date) > 1 and '{date}' not in args.output:
+            print("❌ Error: --output must contain {date} when exporting several dates")
+            sys.exit(1)
+
+        # Exports mostly wait on Trino, so dates run concurrently; each export_date uses its own
+        # cursor and the connection's pooled HTTP session is shared between them
+        with ThreadPoolExecutor(max_workers=min(MAX_EXPORT_WORKERS, len(args.date))) as executor:
+            futures = [executor.submit(export_date, conn, date, args.output.replace('{date}', date))
+                       for date in args.date]
+            for future in futures:
+                future.result()
 
     else:
         parser.print_help()
@@ -3,9 +3,12 @@
 Fix all AWS test manifests to use Core's proven format.
 """
 
-import yaml
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import yaml
+
 # Core's proven instance_type format
 Core_INSTANCE_TYPE = {
     'inst_type': 'm5.large',
@@ -19,6 +22,9 @@ Core_INSTANCE_TYPE = {
     'saving': 0.2               # Numeric value (not null)
 }
 
+# Upper bound on manifests fixed concurrently
+MAX_FIX_WORKERS = 8
+
 def fix_manifest(manifest_path):
     """Fix a single manifest to use Core format."""
     print(f"\n📝 Processing {manifest_path.name}...")
@@ -96,6 +102,14 @@ def fix_manifest(manifest_path):
 
     print(f"  ✓ Fixed {manifest_path.name}")
 
+def fix_manifest_safely(manifest_path):
+    """Fix a single manifest, returning the error message instead of raising (None on success)."""
+    try:
+        fix_manifest(manifest_path)
+        return None
+    except Exception as e:
+        return str(e)
+
 def main():
     manifest_dir = Path('test-manifests')
     manifests = sorted(manifest_dir.glob('ocp_aws_scenario_*.yml'))
@@ -105,13 +119,20 @@ def main():
 
     print(f"Found {len(manifests)} manifests to fix")
 
+    # Manifests are independent, so they are fixed in parallel processes
+    if len(manifests) > 1:
+        workers = min(MAX_FIX_WORKERS, os.cpu_count() or 1, len(manifests))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            errors = list(executor.map(fix_manifest_safely, manifests))
+    else:
+        errors = [fix_manifest_safely(manifest_path) for manifest_path in manifests]
+
     fixed_count = 0
-    for manifest_path in manifests:
-        try:
-            fix_manifest(manifest_path)
+    for manifest_path, error in zip(manifests, errors):
+        if error is None:
             fixed_count += 1
-        except Exception as e:
-            print(f"  ❌ Error fixing {manifest_path.name}: {e}")
+        else:
+            print(f"  ❌ Error fixing {manifest_path.name}: {error}")
 
     print(f"\n✅ Fixed {fixed_count}/{len(manifests)} manifests")
     print("\nNext: Run E2E tests with:")
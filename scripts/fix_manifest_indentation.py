@@ -11,57 +11,61 @@ Should be:
     node_name: ...  # ← Same level (correct!)
 """
 
+import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Upper bound on manifests fixed concurrently
+MAX_FIX_WORKERS = 8
+
+# List item with a label (- node:, - pod:, - volume:, - volume_claim:)
+LABELED_ITEM_RE = re.compile(rb'^(\s*)-\s+(?:node|pod|volume|volume_claim):\s*$')
+
+
 def fix_manifest(file_path):
     """Fix indentation in a single manifest file."""
-    with open(file_path, 'r') as f:
-        content = f.read()
+    # Lines are handled as bytes with their own line endings, which are written back unchanged
+    with open(file_path, 'rb') as f:
+        lines = f.readlines()
 
     # Pattern: After "- node:" or "- pod:" or "- volume:", reduce indentation by 2 spaces
     # This moves the properties to the same level as the key
-
-    # Split into lines
-    lines = content.split('\n')
     fixed_lines = []
     in_fix_zone = False
     base_indent = 0
 
-    for i, line in enumerate(lines):
-        # Check if this is a list item with a label (- node:, - pod:, - volume:, - volume_claim:)
-        if re.match(r'^(\s*)-\s+(node|pod|volume|volume_claim):\s*$', line):
+    for line in lines:
+        stripped = line.lstrip()
+
+        if LABELED_ITEM_RE.match(line):
             fixed_lines.append(line)
             in_fix_zone = True
             # Calculate base indentation (indent of the '-')
-            base_indent = len(line) - len(line.lstrip())
+            base_indent = len(line) - len(stripped)
             continue
 
         # If we're in a fix zone and see a dedent or another list item, exit fix zone
-        if in_fix_zone:
-            current_indent = len(line) - len(line.lstrip()) if line.strip() else 0
+        if in_fix_zone and stripped:
+            current_indent = len(line) - len(stripped)
             # Exit if we hit another list item at same or lower indent
-            if line.strip() and (line.lstrip().startswith('-') or current_indent <= base_indent):
+            if stripped.startswith(b'-') or current_indent <= base_indent:
                 in_fix_zone = False
             # Fix indentation: reduce by 2 spaces (but stay at least at base_indent + 2)
-            elif line.strip():
-                target_indent = base_indent + 2
-                if current_indent > target_indent:
-                    # Reduce indentation
-                    fixed_line = ' ' * target_indent + line.lstrip()
-                    fixed_lines.append(fixed_line)
-                    continue
+            elif current_indent > base_indent + 2:
+                fixed_lines.append(b' ' * (base_indent + 2) + stripped)
+                continue
 
         fixed_lines.append(line)
 
     # Write back
-    fixed_content = '\n'.join(fixed_lines)
-    with open(file_path, 'w') as f:
-        f.write(fixed_content)
+    with open(file_path, 'wb') as f:
+        f.writelines(fixed_lines)
 
     print(f"✓ Fixed {file_path}")
 
+
 def main():
     # Fix all scenario manifests
     manifest_dir = Path('test-manifests')
@@ -73,8 +77,14 @@ def main():
 
     print(f"Fixing {len(manifests)} manifests...\n")
 
-    for manifest in manifests:
-        fix_manifest(manifest)
+    # Manifests are independent, so they are fixed in parallel processes
+    if len(manifests) > 1:
+        workers = min(MAX_FIX_WORKERS, os.cpu_count() or 1, len(manifests))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fix_manifest, manifests))
+    else:
+        for manifest in manifests:
+            fix_manifest(manifest)
 
     print(f"\n✓ Fixed {len(manifests)} manifests!")
     print("\nVerify with:")
@@ -7,15 +7,26 @@ AWS sections: resource_id with i- prefix
 """
 
 import yaml
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAML_LOADER, CSafeDumper as YAML_DUMPER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER, SafeDumper as YAML_DUMPER
+
+# Upper bound on manifests fixed concurrently
+MAX_FIX_WORKERS = 8
+
 
 def fix_manifest(manifest_path):
     """Fix resource_id format in a manifest file."""
 
     with open(manifest_path, 'r') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=YAML_LOADER)
 
     changes = []
 
@@ -48,7 +59,7 @@ def fix_manifest(manifest_path):
     if changes:
         # Write back
         with open(manifest_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(data, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False)
 
         print(f"✓ Fixed {manifest_path}")
         for change in changes:
@@ -60,13 +71,20 @@ def fix_manifest(manifest_path):
 
 
 def main():
+    if YAML_LOADER is yaml.SafeLoader:
+        print("  ⚠️  PyYAML has no libyaml support, using the pure-Python loader/dumper (pip install PyYAML[libyaml])")
     manifest_dir = Path('test-manifests')
-    manifests = list(manifest_dir.glob('ocp_aws_scenario_*.yml'))
+    manifests = sorted(manifest_dir.glob('ocp_aws_scenario_*.yml'))
+
+    # Manifests are independent, so they are fixed in parallel processes
+    if len(manifests) > 1:
+        workers = min(MAX_FIX_WORKERS, os.cpu_count() or 1, len(manifests))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fixed = list(executor.map(fix_manifest, manifests))
+    else:
+        fixed = [fix_manifest(manifest) for manifest in manifests]
 
-    fixed_count = 0
-    for manifest in sorted(manifests):
-        if fix_manifest(manifest):
-            fixed_count += 1
+    fixed_count = sum(fixed)
 
     print(f"\n✓ Fixed {fixed_count}/{len(manifests)} manifests")
 
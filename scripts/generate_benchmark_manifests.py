@@ -14,7 +14,8 @@ For simplicity, we use 1 AWS resource per node, so:
 """
 
 import os
-import yaml
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 # Benchmark scale configurations
@@ -73,115 +74,117 @@ SCALES = {
     },
 }
 
-def generate_manifest(scale_name: str, config: dict) -> dict:
-    """Generate a nise manifest for a benchmark scale.
+# Per-node YAML blocks, formatted as text rather than dumped with PyYAML. Indentation
+# matches yaml.dump output for the 'generators:' lists (the entries are nested one level deep)
+OCP_GENERATOR_TEMPLATE = """\
+  - OCPGenerator:
+      start_date: '2025-10-01'
+      end_date: '2025-10-02'
+      nodes:
+      - node: null
+        node_name: {node_name}
+        resource_id: {resource_id}
+        cpu_cores: 16
+        memory_gig: 64
+        namespaces:
+"""
+
+NAMESPACE_TEMPLATE = """\
+          {ns_name}:
+            pods:
+"""
+
+POD_TEMPLATE = """\
+            - pod: null
+              pod_name: {pod_name}
+              cpu_request: 1
+              mem_request_gig: 2
+              cpu_limit: 2
+              mem_limit_gig: 4
+              pod_seconds: 3600
+              cpu_usage:
+                full_period: 0.8
+              mem_usage_gig:
+                full_period: 1.5
+"""
+
+EC2_GENERATOR_TEMPLATE = """\
+  - EC2Generator:
+      start_date: '2025-10-01'
+      end_date: '2025-10-02'
+      resource_id: {resource_id}
+      instance_type:
+        inst_type: m5.4xlarge
+        physical_cores: 8
+        vcpu: '16'
+        memory: 64 GiB
+        cost: 0.768
+        rate: 0.768
+      tags:
+        openshift_cluster: benchmark-cluster
+        openshift_node: {node_name}
+"""
+
+
+def ocp_generator_yaml(node_idx: int, config: dict) -> str:
+    """Render the OCPGenerator entry for one benchmark node.
 
     Uses separate OCPGenerator entries per node because nise only processes
     the last node when multiple nodes are in a single generator.
     """
+    namespaces = config['namespaces']
+    pods_per_namespace = config['pods_per_node'] // namespaces
+
+    parts = [OCP_GENERATOR_TEMPLATE.format(node_name=f'bench-node-{node_idx:03d}',
+                                           resource_id=f'i-bench-node-{node_idx:03d}')]
+
+    # Generate namespaces and pods (pod names are unique per node)
+    for ns_idx in range(1, namespaces + 1):
+        parts.append(NAMESPACE_TEMPLATE.format(ns_name=f'bench-ns-{ns_idx:02d}'))
+        for pod_idx in range(1, pods_per_namespace + 1):
+            parts.append(POD_TEMPLATE.format(pod_name=f'app-n{node_idx:03d}-{pod_idx:03d}'))
 
+    return ''.join(parts)
+
+
+def write_manifest(f, config: dict):
+    """Stream a nise manifest for a benchmark scale into an open file.
+
+    Only one generator entry is held in memory at a time: each OCPGenerator/EC2Generator
+    block is formatted from its template and written as it is built.
+    """
     nodes = config['nodes']
-    pods_per_node = config['pods_per_node']
-    namespaces = config['namespaces']
-    pods_per_namespace = pods_per_node // namespaces
-
-    total_pods = nodes * pods_per_node
-    expected_ocp_rows = total_pods * 24  # 24 hours
-    # Output rows = OCP pod-hours (each pod-hour matches one AWS node-hour)
-    expected_output_rows = expected_ocp_rows  # 1:1 matching
-
-    manifest = {
-        '__comment__': f"""
-Benchmark Scale: {scale_name}
-Target: {config['target_rows']:,} output rows (±1%)
-Configuration:
-  - Nodes: {nodes}
-  - Pods per node: {pods_per_node}
-  - Total pods: {total_pods}
-  - Namespaces: {namespaces}
-  - Hours: 24
-Expected:
-  - OCP rows: ~{expected_ocp_rows:,}
-  - Output rows (after matching): ~{expected_output_rows:,}
-""",
-        'start_date': '2025-10-01',
-        'end_date': '2025-10-02',
-        'ocp': {
-            'generators': []  # One generator per node
-        },
-        'aws': {
-            'generators': []
-        }
-    }
-
-    # Generate nodes - each as a separate OCPGenerator
+
+    f.write("start_date: '2025-10-01'\nend_date: '2025-10-02'\n")
+
+    # One OCPGenerator per node
+    f.write("ocp:\n  generators:\n")
+    for node_idx in range(1, nodes + 1):
+        f.write(ocp_generator_yaml(node_idx, config))
+
+    # Matching EC2 instance per node
+    f.write("aws:\n  generators:\n")
     for node_idx in range(1, nodes + 1):
-        node_name = f'bench-node-{node_idx:03d}'
-        resource_id = f'i-bench-node-{node_idx:03d}'
-
-        node = {
-            'node': None,  # Required by nise
-            'node_name': node_name,
-            'resource_id': resource_id,
-            'cpu_cores': 16,
-            'memory_gig': 64,
-            'namespaces': {}
-        }
-
-        # Generate namespaces and pods
-        for ns_idx in range(1, namespaces + 1):
-            ns_name = f'bench-ns-{ns_idx:02d}'
-
-            # Explicitly generate each pod
-            pods = []
-            for pod_idx in range(1, pods_per_namespace + 1):
-                pods.append({
-                    'pod': None,  # Required by nise
-                    'pod_name': f'app-n{node_idx:03d}-{pod_idx:03d}',  # Unique pod names per node
-                    'cpu_request': 1,
-                    'mem_request_gig': 2,
-                    'cpu_limit': 2,
-                    'mem_limit_gig': 4,
-                    'pod_seconds': 3600,
-                    'cpu_usage': {'full_period': 0.8},
-                    'mem_usage_gig': {'full_period': 1.5}
-                })
-
-            node['namespaces'][ns_name] = {'pods': pods}
-
-        # Add as separate OCPGenerator entry
-        ocp_generator = {
-            'OCPGenerator': {
-                'start_date': '2025-10-01',
-                'end_date': '2025-10-02',
-                'nodes': [node]  # Single node per generator
-            }
-        }
-        manifest['ocp']['generators'].append(ocp_generator)
-
-        # Generate matching EC2 instance
-        ec2 = {
-            'EC2Generator': {
-                'start_date': '2025-10-01',
-                'end_date': '2025-10-02',
-                'resource_id': resource_id,
-                'instance_type': {
-                    'inst_type': 'm5.4xlarge',
-                    'physical_cores': 8,
-                    'vcpu': '16',
-                    'memory': '64 GiB',
-                    'cost': 0.768,
-                    'rate': 0.768
-                },
-                'tags': {
-                    'openshift_cluster': 'benchmark-cluster',
-                    'openshift_node': node_name
-                }
-            }
-        }
-        manifest['aws']['generators'].append(ec2)
-
-    return manifest
+        f.write(EC2_GENERATOR_TEMPLATE.format(node_name=f'bench-node-{node_idx:03d}',
+                                              resource_id=f'i-bench-node-{node_idx:03d}'))
+
+
+def generate_scale(output_dir: Path, scale_name: str, config: dict) -> Path:
+    """Write the manifest for one benchmark scale and return its path."""
+    output_file = output_dir / f'benchmark_{scale_name}.yml'
+
+    # Stream the YAML so only one generator is in memory at a time
+    with open(output_file, 'w') as f:
+        # Write header comment
+        f.write(f"# Benchmark Scale: {scale_name}\n")
+        f.write(f"# Target: {config['target_rows']:,} output rows (±1%)\n")
+        f.write(f"# Nodes: {config['nodes']}, Pods/node: {config['pods_per_node']}\n")
+        f.write(f"# Total pods: {config['nodes'] * config['pods_per_node']}\n")
+        f.write("#\n")
+
+        write_manifest(f, config)
+
+    return output_file
 
 
 def main():
@@ -192,31 +195,18 @@ def main():
     print("Generating OCP-on-AWS benchmark manifests...")
     print("=" * 60)
 
-    for scale_name, config in SCALES.items():
-        manifest = generate_manifest(scale_name, config)
-
-        # Write manifest
-        output_file = output_dir / f'benchmark_{scale_name}.yml'
-
-        # Custom YAML dump to preserve formatting
-        with open(output_file, 'w') as f:
-            # Write header comment
-            f.write(f"# Benchmark Scale: {scale_name}\n")
-            f.write(f"# Target: {config['target_rows']:,} output rows (±1%)\n")
-            f.write(f"# Nodes: {config['nodes']}, Pods/node: {config['pods_per_node']}\n")
-            f.write(f"# Total pods: {config['nodes'] * config['pods_per_node']}\n")
-            f.write("#\n")
+    # Scales are independent files, so they are written in parallel processes
+    # (the run then takes about as long as the largest scale)
+    workers = min(len(SCALES), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        output_files = executor.map(generate_scale, repeat(output_dir), SCALES.keys(), SCALES.values())
 
-            # Remove comment key before dumping
-            del manifest['__comment__']
+        for (scale_name, config), output_file in zip(SCALES.items(), output_files):
+            total_pods = config['nodes'] * config['pods_per_node']
+            expected_rows = total_pods * 24 * 2
 
-            yaml.dump(manifest, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
-
-        total_pods = config['nodes'] * config['pods_per_node']
-        expected_rows = total_pods * 24 * 2
-
-        print(f"✓ {scale_name}: {config['nodes']} nodes, {total_pods} pods → ~{expected_rows:,} rows")
-        print(f"  Written to: {output_file}")
+            print(f"✓ {scale_name}: {config['nodes']} nodes, {total_pods} pods → ~{expected_rows:,} rows")
+            print(f"  Written to: {output_file}")
 
     print("=" * 60)
     print("All manifests generated!")
@@ -229,4 +219,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -7,10 +7,16 @@ Ensures consistent format, proper YAML, correct instance_type, etc.
 import yaml
 from pathlib import Path
 
+# libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as YAML_DUMPER
+except ImportError:
+    from yaml import SafeDumper as YAML_DUMPER
+
 def write_manifest(filename, data):
     """Write manifest with proper YAML formatting."""
     with open(f'test-manifests/{filename}', 'w') as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        yaml.dump(data, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False, allow_unicode=True)
     print(f"✓ Generated {filename}")
 
 # Base template from working scenario 1
@@ -271,6 +277,8 @@ for i in range(5, 13):
 
 # Write all scenarios
 print("Regenerating test manifests from working template...")
+if YAML_DUMPER is yaml.SafeDumper:
+    print("  ⚠️  PyYAML has no libyaml support, using the pure-Python dumper (pip install PyYAML[libyaml])")
 print()
 for filename, data in scenarios.items():
     write_manifest(filename, data)
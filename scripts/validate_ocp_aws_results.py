@@ -14,6 +14,12 @@ from pathlib import Path
 from typing import Dict, Any, List
 from decimal import Decimal
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 
 class OCPAWSResultValidator:
     """Validates OCP-AWS aggregation results against expected values."""
@@ -34,7 +40,7 @@ class OCPAWSResultValidator:
     def load_manifest(self) -> Dict[str, Any]:
         """Load and parse test manifest."""
         with open(self.manifest_path, 'r') as f:
-            self.manifest_data = yaml.safe_load(f)
+            self.manifest_data = yaml.load(f, Loader=YAML_LOADER)
         return self.manifest_data
 
     def get_expected_outcomes(self) -> Dict[str, Any]:
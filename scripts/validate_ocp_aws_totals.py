@@ -20,11 +20,17 @@ from pathlib import Path
 from decimal import Decimal
 from typing import Dict, Any
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 
 def load_manifest(manifest_path: str) -> Dict[str, Any]:
     """Load test manifest."""
     with open(manifest_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
 
 
 def detect_cost_column(manifest: Dict[str, Any], manifest_path: str) -> str:
@@ -20,11 +20,17 @@ import psycopg2
 from decimal import Decimal
 from typing import Dict, Any, Optional
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 
 def load_manifest(manifest_path: str) -> Dict[str, Any]:
     """Load test manifest."""
     with open(manifest_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
 
 
 def get_db_connection():
@@ -20,16 +20,72 @@ Usage:
     )
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional
 
 import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
 from .parquet_reader import ParquetReader
 from .utils import PerformanceTimer, format_bytes, get_logger
 
+# Koku's prefixes (case-sensitive)
+RESOURCE_TAG_PREFIX = "resourceTags/"
+
+# Direct tag columns that nise generates (both OpenShift-specific and generic)
+# These columns contain tag values directly instead of in resourceTags/* format
+DIRECT_TAG_COLUMNS = [
+    # OpenShift-specific tags
+    "openshift_cluster",
+    "openshift_node",
+    "openshift_project",
+    # Generic tags (commonly used by customers for cost attribution)
+    "app",
+    "component",
+    "environment",
+    "tier",
+    "team",
+    "nodeclass",
+    "node_role_kubernetes_io",
+    "version",
+    "storageclass",
+]
+DIRECT_TAG_SET = frozenset(DIRECT_TAG_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def _encode_tag_key(tag_name: str) -> str:
+    """Encode a tag name once into its ', "name": ' JSON fragment prefix."""
+    return ", " + orjson.dumps(tag_name).decode() + ": "
+
+
+# Low-cardinality CUR string columns (tens to hundreds of distinct values)
+AWS_CUR_CATEGORICAL_COLUMNS = [
+    "lineitem_productcode",
+    "lineitem_usagetype",
+    "lineitem_operation",
+    "lineitem_lineitemtype",
+    "lineitem_usageaccountid",
+    "product_productfamily",
+    "product_region",
+    "product_instancetype",
+    "pricing_unit",
+]
+
+# CUR usage columns that fit in float32. Cost columns stay float64: float32 keeps ~7 significant
+# digits, and summed over millions of rows the drift exceeds the totals validation tolerance
+AWS_CUR_FLOAT_COLUMNS = [
+    "lineitem_usageamount",
+]
+
+# Categories of data_transfer_direction (code -1 means not a network cost)
+DATA_TRANSFER_DIRECTIONS = ["IN", "OUT"]
+
 
 class AWSDataLoader:
     """
@@ -54,6 +110,52 @@ class AWSDataLoader:
 
         self.logger.info("Initialized AWS data loader")
 
+    @staticmethod
+    def _dictionary_encode(series: pd.Series) -> pa.DictionaryArray:
+        """
+        Convert a string column to an Arrow dictionary array.
+
+        Categorical columns are converted zero-copy; other columns are encoded once.
+
+        Args:
+            series: String (object or categorical) Series
+
+        Returns:
+            Dictionary-encoded Arrow array
+        """
+        array = pa.array(series, from_pandas=True)
+        if pa.types.is_dictionary(array.type):
+            return array
+        return array.cast(pa.string()).dictionary_encode()
+
+    @staticmethod
+    def _dictionary_contains(encoded: pa.DictionaryArray, pattern: str) -> pa.Array:
+        """
+        Case-insensitive substring match evaluated once per distinct value.
+
+        Args:
+            encoded: Dictionary-encoded string array
+            pattern: Substring to search for
+
+        Returns:
+            Row-length boolean array (nulls are False)
+        """
+        matches = pc.match_substring(encoded.dictionary, pattern, ignore_case=True)
+        return pc.fill_null(pc.take(matches, encoded.indices), False)
+
+    @staticmethod
+    def _no_data_transfer_direction(length: int) -> pd.Categorical:
+        """
+        All-null data_transfer_direction column (no network costs).
+
+        Args:
+            length: Number of rows
+
+        Returns:
+            Categorical of IN/OUT with every code -1
+        """
+        return pd.Categorical.from_codes(np.full(length, -1, dtype=np.int8), categories=DATA_TRANSFER_DIRECTIONS)
+
     def _detect_network_costs(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Detect network/data transfer costs per Trino logic.
@@ -76,12 +178,10 @@ class AWSDataLoader:
         Returns:
             DataFrame with data_transfer_direction column added
         """
-        # Initialize column
-        df["data_transfer_direction"] = None
-
         # Check if required columns exist
         if "lineitem_productcode" not in df.columns or "product_productfamily" not in df.columns:
             self.logger.warning("Missing columns for network detection, skipping")
+            df["data_transfer_direction"] = self._no_data_transfer_direction(len(df))
             return df
 
         # Identify network records
@@ -89,55 +189,92 @@ class AWSDataLoader:
 
         if not is_network.any():
             self.logger.info("No network/data transfer costs found")
+            df["data_transfer_direction"] = self._no_data_transfer_direction(len(df))
             return df
 
-        # Determine direction for network records
-        usage_type_lower = df["lineitem_usagetype"].str.lower()
-        operation_lower = (
-            df["lineitem_operation"].str.lower() if "lineitem_operation" in df.columns else pd.Series([""] * len(df))
+        # Determine direction for network records. Usage types and operations have
+        # very few distinct values, so substrings are matched on the dictionary
+        # values only and expanded back to rows through the dictionary indices.
+        usage_type = self._dictionary_encode(df["lineitem_usagetype"])
+        operation = self._dictionary_encode(df["lineitem_operation"]) if "lineitem_operation" in df.columns else None
+        is_network = pa.array(is_network, from_pandas=True)
+
+        def usage_type_contains(pattern: str) -> pa.Array:
+            return pc.and_(is_network, self._dictionary_contains(usage_type, pattern))
+
+        conditions = {}
+        if operation is not None:
+            # Regional direction takes precedence over in/out-bytes; skipped
+            # entirely when the CUR does not ship lineitem_operation
+            is_regional = usage_type_contains("regional-bytes")
+            conditions["regional_out"] = (pc.and_(is_regional, self._dictionary_contains(operation, "-out")), "OUT")
+            conditions["regional_in"] = (pc.and_(is_regional, self._dictionary_contains(operation, "-in")), "IN")
+        conditions["out_bytes"] = (usage_type_contains("out-bytes"), "OUT")
+        conditions["in_bytes"] = (usage_type_contains("in-bytes"), "IN")
+
+        # First matching condition wins; the result holds the category codes and
+        # is the only write to the direction column
+        direction_codes = pc.case_when(
+            pc.make_struct(*(mask for mask, _ in conditions.values()), field_names=list(conditions)),
+            *(pa.scalar(DATA_TRANSFER_DIRECTIONS.index(direction), pa.int8()) for _, direction in conditions.values()),
         )
+        codes = pc.fill_null(direction_codes, -1).to_numpy()
+        df["data_transfer_direction"] = pd.Categorical.from_codes(codes, categories=DATA_TRANSFER_DIRECTIONS)
 
-        # IN-bytes
-        df.loc[
-            is_network & usage_type_lower.str.contains("in-bytes", na=False),
-            "data_transfer_direction",
-        ] = "IN"
-
-        # OUT-bytes
-        df.loc[
-            is_network & usage_type_lower.str.contains("out-bytes", na=False),
-            "data_transfer_direction",
-        ] = "OUT"
-
-        # Regional IN
-        df.loc[
-            is_network
-            & usage_type_lower.str.contains("regional-bytes", na=False)
-            & operation_lower.str.contains("-in", na=False),
-            "data_transfer_direction",
-        ] = "IN"
-
-        # Regional OUT
-        df.loc[
-            is_network
-            & usage_type_lower.str.contains("regional-bytes", na=False)
-            & operation_lower.str.contains("-out", na=False),
-            "data_transfer_direction",
-        ] = "OUT"
-
-        network_in = (df["data_transfer_direction"] == "IN").sum()
-        network_out = (df["data_transfer_direction"] == "OUT").sum()
+        # One pass over the codes for all log counts
+        network_in, network_out = np.bincount(codes[codes >= 0], minlength=len(DATA_TRANSFER_DIRECTIONS))
 
         self.logger.info(
             "✓ Network cost detection complete",
             total_records=len(df),
-            network_records=is_network.sum(),
-            network_in=network_in,
-            network_out=network_out,
+            network_records=pc.sum(is_network).as_py(),
+            network_in=int(network_in),
+            network_out=int(network_out),
         )
 
         return df
 
+    @staticmethod
+    def _line_item_type_mask(line_item_type: pd.Series, types: List[str]) -> np.ndarray:
+        """
+        Boolean mask of rows whose line item type is one of ``types``.
+
+        For categorical columns the comparison runs on the integer codes.
+
+        Args:
+            line_item_type: lineitem_lineitemtype column
+            types: Line item types to match
+
+        Returns:
+            Boolean numpy array
+        """
+        if isinstance(line_item_type.dtype, pd.CategoricalDtype):
+            categories = line_item_type.cat.categories
+            codes = [categories.get_loc(t) for t in types if t in categories]
+            return np.isin(line_item_type.cat.codes.to_numpy(), codes)
+        return line_item_type.isin(types).to_numpy()
+
+    @staticmethod
+    def _present_line_item_types(line_item_type: pd.Series) -> set:
+        """
+        Line item types that may occur in ``line_item_type`` (None for nulls).
+
+        For categorical columns this is read from the categories, without a
+        pass over the rows; it may include types no longer present.
+
+        Args:
+            line_item_type: lineitem_lineitemtype column
+
+        Returns:
+            Set of line item types
+        """
+        if isinstance(line_item_type.dtype, pd.CategoricalDtype):
+            types = set(line_item_type.cat.categories)
+            if line_item_type.hasnans:
+                types.add(None)
+            return types
+        return {None if pd.isna(t) else t for t in line_item_type.unique()}
+
     def _handle_savings_plan_costs(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Handle SavingsPlan and Tax line items per Trino logic.
@@ -164,46 +301,78 @@ class AWSDataLoader:
             self.logger.info("savingsplan_savingsplaneffectivecost column not found, no SavingsPlan data to handle")
             df["savingsplan_savingsplaneffectivecost"] = 0.0
 
+        sp_effective_cost = df["savingsplan_savingsplaneffectivecost"].to_numpy()
+        line_item_types = self._present_line_item_types(df["lineitem_lineitemtype"])
+
         # SavingsPlanCoveredUsage: set unblended/blended to 0 (COST-5098)
-        # BUT ONLY if there's a valid savingsplan_effectivecost
+        # BUT ONLY if there's a valid savingsplan_effectivecost (NaN > 0 is False)
         # (nise's default instances have saving values that trigger SavingsPlanCoveredUsage even when not intended)
-        is_sp_covered = (
-            (df["lineitem_lineitemtype"] == "SavingsPlanCoveredUsage")
-            & (df["savingsplan_savingsplaneffectivecost"].notna())
-            & (df["savingsplan_savingsplaneffectivecost"] > 0)
-        )
-        sp_covered_count = is_sp_covered.sum()
-
-        if sp_covered_count > 0:
-            df.loc[is_sp_covered, "lineitem_unblendedcost"] = 0.0
-            df.loc[is_sp_covered, "lineitem_blendedcost"] = 0.0
-            self.logger.info(
-                "Set SavingsPlanCoveredUsage costs to 0 (COST-5098)",
-                records_affected=sp_covered_count,
+        if "SavingsPlanCoveredUsage" in line_item_types:
+            is_sp_covered = self._line_item_type_mask(df["lineitem_lineitemtype"], ["SavingsPlanCoveredUsage"]) & (
+                sp_effective_cost > 0
             )
+            sp_covered_count = int(np.count_nonzero(is_sp_covered))
 
-        # calculated_amortized_cost logic
-        is_tax_or_usage = df["lineitem_lineitemtype"].isin(["Tax", "Usage"])
-
-        # Ensure savingsplan_savingsplaneffectivecost exists
-        if "savingsplan_savingsplaneffectivecost" not in df.columns:
-            df["savingsplan_savingsplaneffectivecost"] = 0.0
+            if sp_covered_count > 0:
+                df.loc[is_sp_covered, "lineitem_unblendedcost"] = 0.0
+                df.loc[is_sp_covered, "lineitem_blendedcost"] = 0.0
+                self.logger.info(
+                    "Set SavingsPlanCoveredUsage costs to 0 (COST-5098)",
+                    records_affected=sp_covered_count,
+                )
 
-        # Calculate amortized cost per Trino logic
-        df["lineitem_calculated_amortizedcost"] = np.where(
-            is_tax_or_usage,
-            df["lineitem_unblendedcost"],
-            df["savingsplan_savingsplaneffectivecost"],
-        )
+        # Calculate amortized cost per Trino logic: unblended cost for Tax/Usage,
+        # SavingsPlan effective cost otherwise (no mask needed when not mixed)
+        if line_item_types <= {"Tax", "Usage"}:
+            df["lineitem_calculated_amortizedcost"] = df["lineitem_unblendedcost"]
+            tax_or_usage_count = len(df)
+        elif line_item_types.isdisjoint({"Tax", "Usage"}):
+            df["lineitem_calculated_amortizedcost"] = sp_effective_cost
+            tax_or_usage_count = 0
+        else:
+            is_tax_or_usage = self._line_item_type_mask(df["lineitem_lineitemtype"], ["Tax", "Usage"])
+            df["lineitem_calculated_amortizedcost"] = np.where(
+                is_tax_or_usage,
+                df["lineitem_unblendedcost"].to_numpy(),
+                sp_effective_cost,
+            )
+            tax_or_usage_count = int(np.count_nonzero(is_tax_or_usage))
 
         self.logger.info(
             "✓ Calculated amortized cost logic applied",
-            tax_or_usage_count=is_tax_or_usage.sum(),
-            sp_effective_cost_count=(~is_tax_or_usage).sum(),
+            tax_or_usage_count=tax_or_usage_count,
+            sp_effective_cost_count=len(df) - tax_or_usage_count,
         )
 
         return df
 
+    def _optimize_aws_cur_memory(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reduce AWS CUR memory by using categorical dtypes and float32 usage amounts.
+
+        Done once on the combined DataFrame (per-file categoricals would fall back
+        to object on concat). Comparisons, isin and groupby on categoricals work on
+        integer codes instead of Python strings.
+
+        Args:
+            df: AWS CUR DataFrame
+
+        Returns:
+            DataFrame with optimized dtypes
+        """
+        if not self.config.get("performance", {}).get("use_categorical", True):
+            return df
+
+        for col in AWS_CUR_CATEGORICAL_COLUMNS:
+            if col in df.columns and df[col].dtype == "object":
+                df[col] = df[col].astype("category")
+
+        for col in AWS_CUR_FLOAT_COLUMNS:
+            if col in df.columns and df[col].dtype == "float64":
+                df[col] = pd.to_numeric(df[col], downcast="float")
+
+        return df
+
     def _consolidate_resource_tags(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Consolidate expanded resourceTags columns into single JSON column.
@@ -217,35 +386,12 @@ class AWSDataLoader:
         Also handles direct OpenShift tag columns (openshift_cluster, openshift_node, openshift_project)
         that nise generates for tag-based matching scenarios.
         """
-        import json
-
-        # Koku's prefixes (case-sensitive)
-        RESOURCE_TAG_PREFIX = "resourceTags/"
-
-        # Direct tag columns that nise generates (both OpenShift-specific and generic)
-        # These columns contain tag values directly instead of in resourceTags/* format
-        DIRECT_TAG_COLUMNS = [
-            # OpenShift-specific tags
-            "openshift_cluster",
-            "openshift_node",
-            "openshift_project",
-            # Generic tags (commonly used by customers for cost attribution)
-            "app",
-            "component",
-            "environment",
-            "tier",
-            "team",
-            "nodeclass",
-            "node_role_kubernetes_io",
-            "version",
-            "storageclass",
-        ]
-
         # Find all resourceTags/* columns (koku looks for prefix match)
-        tag_columns = [col for col in df.columns if RESOURCE_TAG_PREFIX in col]
+        tag_columns = [col for col in df.columns if col.startswith(RESOURCE_TAG_PREFIX)]
 
-        # Find direct OpenShift tag columns
-        direct_tag_columns = [col for col in DIRECT_TAG_COLUMNS if col in df.columns]
+        # Find direct OpenShift tag columns (in DIRECT_TAG_COLUMNS order)
+        present_columns = set(df.columns)
+        direct_tag_columns = [col for col in DIRECT_TAG_COLUMNS if col in present_columns]
 
         if not tag_columns and not direct_tag_columns:
             self.logger.debug("No resourceTags columns found, adding empty JSON column")
@@ -256,30 +402,36 @@ class AWSDataLoader:
             f"Consolidating {len(tag_columns)} resourceTags/* columns + {len(direct_tag_columns)} direct tag columns into JSON"
         )
 
-        # Koku's scrub function: removes prefix to get tag name
-        def scrub_tag_name(col: str) -> str:
-            return col.replace(RESOURCE_TAG_PREFIX, "")
-
-        # Combine both types of tag columns
-        all_tag_columns = tag_columns + direct_tag_columns
-        tag_df = df[all_tag_columns]
-
-        def consolidate_row(row):
-            """Build tag dict for a single row, handling empty/null values."""
-            tags = {}
-            for col, val in row.items():
-                if pd.notna(val) and val != "" and val is not None:
-                    # For resourceTags/* columns, scrub the prefix
-                    if RESOURCE_TAG_PREFIX in col:
-                        tag_name = scrub_tag_name(col)
-                    else:
-                        # For direct columns, use as-is
-                        tag_name = col
-                    tags[tag_name] = val
-            return json.dumps(tags) if tags else "{}"
-
-        # Apply consolidation row by row
-        df["resourcetags"] = tag_df.apply(consolidate_row, axis=1)
+        # Koku's scrub: resourceTags/* columns lose the prefix, direct columns are used as-is
+        tag_names = {col: col[len(RESOURCE_TAG_PREFIX) :] for col in tag_columns}
+        tag_names.update({col: col for col in direct_tag_columns})
+        all_tag_columns = list(tag_names)
+
+        if self.config.get("performance", {}).get("use_arrow_compute", False):
+            df["resourcetags"] = self._join_tag_columns_arrow(df, tag_names)
+        else:
+            # Build the JSON column-wise: each non-empty cell becomes a ', "key": value'
+            # fragment (encoded once per unique value), fragments are concatenated
+            # across columns and the leading separator is stripped. Output has the json.dumps(tags)
+            # layout; values are encoded with orjson (non-ASCII kept as UTF-8).
+            fragments = []
+            for col, tag_name in tag_names.items():
+                key_prefix = _encode_tag_key(tag_name)
+
+                values = df[col]
+                is_valid = values.notna() & (values != "")
+                valid_values = values[is_valid].astype(object)
+                encoded = {
+                    val: key_prefix + orjson.dumps(val, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+                    for val in valid_values.unique()
+                }
+
+                fragment = pd.Series("", index=df.index, dtype=object)
+                fragment[is_valid] = valid_values.map(encoded)
+                fragments.append(fragment)
+
+            joined = fragments[0].str.cat(fragments[1:]) if len(fragments) > 1 else fragments[0]
+            df["resourcetags"] = np.where(joined != "", "{" + joined.str[2:] + "}", "{}")
 
         # Drop individual tag columns (save memory)
         df = df.drop(columns=all_tag_columns)
@@ -287,6 +439,41 @@ class AWSDataLoader:
         self.logger.info(f"✓ Consolidated resourceTags/* + direct tags into 'resourcetags' JSON column")
         return df
 
+    @staticmethod
+    def _join_tag_columns_arrow(df: pd.DataFrame, tag_names: Dict[str, str]) -> np.ndarray:
+        """
+        Build the resourcetags JSON strings with Arrow compute kernels.
+
+        Same output as the pandas path: each distinct value is encoded once into
+        its ', "key": value' fragment, expanded to rows with ``take`` and the
+        fragments are concatenated and wrapped in braces by C++ kernels.
+
+        Args:
+            df: AWS CUR DataFrame
+            tag_names: JSON key for each tag column to consolidate
+
+        Returns:
+            Object array of JSON strings
+        """
+        fragments = []
+        for col, tag_name in tag_names.items():
+            key_prefix = _encode_tag_key(tag_name)
+            codes, uniques = pd.factorize(df[col])
+            # Null and empty cells map to the trailing "" entry
+            encoded = pa.array(
+                [
+                    "" if val == "" else key_prefix + orjson.dumps(val, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+                    for val in uniques
+                ]
+                + [""],
+                type=pa.string(),
+            )
+            fragments.append(encoded.take(np.where(codes < 0, len(uniques), codes)))
+
+        joined = pc.binary_join_element_wise(*fragments, "")
+        tags = pc.binary_join_element_wise("{", pc.utf8_slice_codeunits(joined, 2), "}", "")
+        return tags.to_numpy(zero_copy_only=False)
+
     def get_optimal_columns_aws_cur(self) -> List[str]:
         """
         Get the optimal set of columns to read from AWS CUR Parquet files.
@@ -304,6 +491,8 @@ class AWSDataLoader:
             # Product/Service info
             "lineitem_productcode",  # AWS service (EC2, EBS, RDS, etc.)
             "lineitem_usagetype",  # Usage type (e.g., BoxUsage, EBS:VolumeUsage)
+            "lineitem_operation",  # Operation (network direction detection)
+            "lineitem_lineitemtype",  # Line item type (Usage, Tax, SavingsPlanCoveredUsage, ...)
             "product_instancetype",  # EC2 instance type (m5.large, etc.)
             "product_region",  # AWS region (us-east-1, etc.)
             "product_productfamily",  # Product family (Compute Instance, Storage, etc.)
@@ -314,12 +503,43 @@ class AWSDataLoader:
             "pricing_publicondemandcost",  # Public on-demand cost (amortized base)
             # Usage metrics
             "lineitem_usageamount",  # Usage amount (hours, GB, etc.)
+            "lineitem_normalizedusageamount",  # Normalized usage amount
+            "lineitem_unblendedrate",  # Unblended rate
             "pricing_unit",  # Unit of measure (Hrs, GB, etc.)
             # Time dimension
             "lineitem_usagestartdate",  # Usage start date
-            # NOTE: 'resourcetags' handled separately - we read all resourcetags_* dynamically
+            "lineitem_usageenddate",  # Usage end date
+            # NOTE: resourceTags/* and direct tag columns are discovered from the file schema
         ]
 
+    def _resolve_aws_cur_columns(self, files: List[str]) -> Optional[List[str]]:
+        """
+        Build the column projection for AWS CUR files.
+
+        The optimal columns are known up front, but resourceTags/* columns differ
+        per dataset, so they are discovered from the Parquet footers (schema only,
+        no data pages are read).
+
+        Args:
+            files: List of S3 URIs
+
+        Returns:
+            List of columns to read, or None to read all columns
+        """
+        if not self.config.get("performance", {}).get("column_filtering", True):
+            return None
+
+        wanted = set(self.get_optimal_columns_aws_cur()) | DIRECT_TAG_SET | {"resourcetags"}
+
+        # dict keeps first-seen column order across files
+        columns = {}
+        for file in files:
+            for name in self.parquet_reader.read_parquet_schema(file).names:
+                if name in wanted or name.startswith(RESOURCE_TAG_PREFIX):
+                    columns[name] = None
+
+        return list(columns) or None
+
     def read_aws_line_items_daily(
         self,
         provider_uuid: str,
@@ -327,6 +547,8 @@ class AWSDataLoader:
         month: str,
         streaming: bool = False,
         chunk_size: int = 50000,
+        filters: Optional[pc.Expression] = None,
+        resource_types: Optional[List[str]] = None,
     ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         """
         Read AWS CUR line items (daily aggregated).
@@ -339,6 +561,11 @@ class AWSDataLoader:
             month: Month (e.g., "10")
             streaming: Whether to stream chunks (for large datasets)
             chunk_size: Chunk size for streaming
+            filters: Optional PyArrow filter expression pushed down into the
+                Parquet scan (row groups are skipped using min/max statistics).
+                Only applied in standard (non-streaming) mode.
+            resource_types: Optional product codes; files whose footer statistics
+                show no matching lineitem_productcode are not read at all.
 
         Returns:
             DataFrame or Iterator of DataFrames (if streaming)
@@ -384,11 +611,30 @@ class AWSDataLoader:
                 provider_uuid=provider_uuid,
             )
 
-            # Get optimal columns for filtering
-            # NOTE: We disable column filtering for AWS to capture all resourcetags_* columns
-            # These will be consolidated after reading
-            columns = None
-            self.logger.info("Reading all AWS CUR columns (needed for resourcetags consolidation)")
+            # Skip files whose row group statistics rule out the requested product codes
+            if resource_types:
+                candidate_files = [
+                    file
+                    for file in files
+                    if self.parquet_reader.file_may_contain(file, "lineitem_productcode", resource_types)
+                ]
+                if len(candidate_files) < len(files):
+                    self.logger.info(
+                        "Skipped AWS CUR files by product code statistics",
+                        skipped=len(files) - len(candidate_files),
+                        remaining=len(candidate_files),
+                    )
+                files = candidate_files
+                if not files:
+                    return pd.DataFrame() if not streaming else iter([])
+
+            # Project the optimal columns plus the resourceTags/* columns found in the
+            # file schemas (these are consolidated after reading)
+            columns = self._resolve_aws_cur_columns(files)
+            if columns is None:
+                self.logger.info("Reading all AWS CUR columns")
+            else:
+                self.logger.info(f"Column filtering enabled: reading {len(columns)} AWS CUR columns")
 
             # Read files (streaming or standard)
             if streaming:
@@ -406,7 +652,16 @@ class AWSDataLoader:
                 parallel_workers = self.config.get("performance", {}).get("parallel_readers", 4)
                 self.logger.info(f"Reading AWS CUR with {parallel_workers} parallel workers")
 
-                df = self.parquet_reader._read_files_parallel(files, parallel_workers, columns=columns)
+                df = self.parquet_reader._read_files_parallel(
+                    files,
+                    parallel_workers,
+                    columns=columns,
+                    filters=filters,
+                    categorical_columns=AWS_CUR_CATEGORICAL_COLUMNS,
+                )
+
+                # Low-cardinality strings → categorical, usage amounts → float32
+                df = self._optimize_aws_cur_memory(df)
 
                 self.logger.info(
                     "✓ Loaded AWS CUR data",
@@ -451,6 +706,9 @@ class AWSDataLoader:
         2. Filters by resource types if specified
         3. Removes rows with null resource IDs (can't be matched)
 
+        Both filters are pushed down into the Parquet scan, so row groups that
+        cannot contain matching rows are never decoded.
+
         Args:
             provider_uuid: AWS provider UUID
             year: Year
@@ -463,35 +721,45 @@ class AWSDataLoader:
         """
         self.logger.info("Reading AWS CUR data for resource matching")
 
+        # Push the resource filters down into the Parquet scan
+        filters = pc.field("lineitem_resourceid").is_valid()
+        if resource_types:
+            filters = filters & pc.field("lineitem_productcode").isin(resource_types)
+
         # Read full dataset (will apply column filtering automatically)
         aws_df = self.read_aws_line_items_daily(
             provider_uuid=provider_uuid,
             year=year,
             month=month,
             streaming=False,  # Matching requires full dataset
+            filters=filters,
+            resource_types=resource_types,
         )
 
         if aws_df.empty:
             self.logger.warning("No AWS CUR data to match")
             return aws_df
 
-        # Filter by resource types if specified
+        # The scan already applied both filters in Arrow before conversion to pandas.
+        # The masks below only subset (and copy) the DataFrame if rows still need dropping,
+        # e.g. when the filter could not be pushed down.
+        # Rows with null resource IDs can't be matched by resource ID.
+        keep = aws_df["lineitem_resourceid"].notna()
+        null_count = int((~keep).sum())
+        if resource_types:
+            keep &= aws_df["lineitem_productcode"].isin(resource_types)
+
+        before_count = len(aws_df)
+        aws_df_with_ids = aws_df if keep.all() else aws_df[keep]
+
         if resource_types:
-            before_count = len(aws_df)
-            aws_df = aws_df[aws_df["lineitem_productcode"].isin(resource_types)]
             self.logger.info(
                 f"Filtered AWS CUR by resource types",
                 resource_types=resource_types,
                 before=before_count,
-                after=len(aws_df),
+                after=len(aws_df_with_ids),
             )
 
-        # Remove rows with null resource IDs (can't be matched by resource ID)
-        # These might still be matchable by tags
-        before_count = len(aws_df)
-        aws_df_with_ids = aws_df[aws_df["lineitem_resourceid"].notna()]
-        null_count = before_count - len(aws_df_with_ids)
-
         if null_count > 0:
             self.logger.warning(
                 f"Found {null_count} AWS line items with null resource IDs",
@@ -500,6 +768,10 @@ class AWSDataLoader:
                 percentage=f"{null_count/before_count*100:.1f}%",
             )
 
+        if aws_df_with_ids.empty:
+            self.logger.warning("No AWS CUR resources left to match after filtering")
+            return aws_df_with_ids
+
         self.logger.info(
             "✓ AWS CUR data ready for matching",
             rows=len(aws_df_with_ids),
@@ -190,7 +190,7 @@ class NetworkCostHandler:
             if "calculated_amortized_cost" in result_df.columns:
                 agg_dict["calculated_amortized_cost"] = "sum"
 
-            aggregated = result_df.groupby(group_cols, as_index=False).agg(agg_dict)
+            aggregated = result_df.groupby(group_cols, as_index=False, observed=True).agg(agg_dict)
 
             # Rename AWS columns to POC standard names for compatibility with _format_output
             column_mapping = {
@@ -4,27 +4,59 @@ S3 Adapter for Koku Integration
 This module provides S3 access using boto3 (koku's pattern) instead of s3fs.
 Enables seamless integration with koku's existing S3 infrastructure.
 
+Parquet objects are read through pyarrow's native S3 filesystem, which
+fetches the footer first and then only the needed column chunks (as
+coalesced range GETs) instead of downloading whole objects into memory.
+
 For standalone POC testing, set environment variables:
     S3_ENDPOINT, S3_ACCESS_KEY, S3_SECRET_KEY, S3_BUCKET_NAME
 
 For koku integration, these come from Django settings.
 """
 
-import io
 import os
-from typing import List, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.fs as pafs
 import pyarrow.parquet as pq
 
 from .utils import get_logger
 
 logger = get_logger("s3_adapter")
 
+# Global client/filesystem instances (S3 connections are reused across reads)
+_s3_client = None
+_s3_filesystem = None
+_s3_lock = threading.Lock()
+
+
+def _reset_s3_connections():
+    """Drop the global client/filesystem (their connections are not fork-safe)."""
+    global _s3_client, _s3_filesystem, _s3_lock
+    _s3_client = None
+    _s3_filesystem = None
+    _s3_lock = threading.Lock()
+
+
+# Forked workers (multiprocessing) build their own connections
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_s3_connections)
 
+
+@lru_cache(maxsize=1)
 def get_s3_config():
     """
     Get S3 configuration from koku Django settings or environment variables.
     
+    Read once per process and cached; treat the returned dict as read-only.
+    
     Priority:
     1. Django settings (when running in koku)
     2. Environment variables (standalone testing)
@@ -37,6 +69,7 @@ def get_s3_config():
             'secret_key': getattr(settings, 'S3_SECRET_KEY', None),
             'bucket': getattr(settings, 'S3_BUCKET_NAME', 'cost-usage'),
             'timeout': getattr(settings, 'S3_TIMEOUT', 60),
+            'max_workers': getattr(settings, 'S3_MAX_WORKERS', 4),
         }
     except Exception:
         # Fallback to environment variables for standalone testing
@@ -46,41 +79,88 @@ def get_s3_config():
             'secret_key': os.getenv('S3_SECRET_KEY', os.getenv('AWS_SECRET_ACCESS_KEY', 'minioadmin')),
             'bucket': os.getenv('S3_BUCKET_NAME', 'cost-usage'),
             'timeout': int(os.getenv('S3_TIMEOUT', '60')),
+            'max_workers': int(os.getenv('S3_MAX_WORKERS', '4')),
         }
 
 
 def get_s3_client():
     """
-    Get S3 client using boto3 (koku's pattern).
+    Get or create the global S3 client using boto3 (koku's pattern).
+    
+    The client is shared by all callers and threads so HTTP connections
+    (TCP/TLS handshakes) are kept alive and reused.
     
     Returns:
         boto3 S3 client configured for MinIO/S3
     """
-    import boto3
-    from botocore.config import Config
-    
-    config_dict = get_s3_config()
-    
-    boto_config = Config(
-        connect_timeout=config_dict['timeout'],
-        retries={'max_attempts': 3}
-    )
-    
-    client = boto3.client(
-        's3',
-        endpoint_url=config_dict['endpoint_url'],
-        aws_access_key_id=config_dict['access_key'],
-        aws_secret_access_key=config_dict['secret_key'],
-        config=boto_config,
-    )
+    global _s3_client
+    if _s3_client is None:
+        with _s3_lock:
+            if _s3_client is None:
+                import boto3
+                from botocore.config import Config
+                
+                config_dict = get_s3_config()
+                
+                boto_config = Config(
+                    connect_timeout=config_dict['timeout'],
+                    max_pool_connections=config_dict['max_workers'] * 2,
+                    tcp_keepalive=True,
+                    retries={'mode': 'adaptive', 'max_attempts': 5},
+                )
+                
+                _s3_client = boto3.client(
+                    's3',
+                    endpoint_url=config_dict['endpoint_url'],
+                    aws_access_key_id=config_dict['access_key'],
+                    aws_secret_access_key=config_dict['secret_key'],
+                    config=boto_config,
+                )
+                
+                logger.debug("S3 client created", endpoint=config_dict['endpoint_url'])
+    return _s3_client
+
+
+def get_s3_filesystem() -> pafs.S3FileSystem:
+    """
+    Get or create the global pyarrow S3 filesystem.
     
-    logger.debug("S3 client created", endpoint=config_dict['endpoint_url'])
-    return client
+    Returns:
+        pyarrow S3FileSystem configured for MinIO/S3
+    """
+    global _s3_filesystem
+    if _s3_filesystem is None:
+        with _s3_lock:
+            if _s3_filesystem is None:
+                config_dict = get_s3_config()
+                
+                # pyarrow takes the scheme separately from the host:port endpoint
+                endpoint = urlparse(config_dict['endpoint_url'] or '')
+                kwargs = {}
+                if endpoint.netloc:
+                    kwargs['endpoint_override'] = endpoint.netloc
+                    kwargs['scheme'] = endpoint.scheme or 'https'
+                
+                _s3_filesystem = pafs.S3FileSystem(
+                    access_key=config_dict['access_key'],
+                    secret_key=config_dict['secret_key'],
+                    connect_timeout=config_dict['timeout'],
+                    request_timeout=config_dict['timeout'],
+                    **kwargs,
+                )
+                
+                logger.debug("S3 filesystem created", endpoint=config_dict['endpoint_url'])
+    return _s3_filesystem
 
 
 def read_parquet_from_s3(bucket: str, key: str) -> pq.ParquetFile:
     """
-    Read parquet file from S3/MinIO using boto3.
+    Read parquet file from S3/MinIO.
+    
+    The object is opened as a seekable stream, so only the footer is fetched
+    here; row groups and columns are fetched when they are read. The
+    ParquetFile owns that stream: use it as a context manager (or call
+    close()) to release the S3 connection.
     
     Args:
         bucket: S3 bucket name
@@ -88,21 +168,25 @@ def read_parquet_from_s3(bucket: str, key: str) -> pq.ParquetFile:
         
     Returns:
         PyArrow ParquetFile object
+    
+    Example:
+        with read_parquet_from_s3(bucket, key) as parquet_file:
+            table = parquet_file.read(columns=['namespace'])
     """
-    client = get_s3_client()
+    fs = get_s3_filesystem()
     
     logger.debug("Reading parquet from S3", bucket=bucket, key=key)
     
-    response = client.get_object(Bucket=bucket, Key=key)
-    data = response['Body'].read()
-    
-    return pq.ParquetFile(io.BytesIO(data))
+    return pq.ParquetFile(f"{bucket}/{key}", filesystem=fs)
 
 
 def read_parquet_table_from_s3(bucket: str, key: str, columns: Optional[List[str]] = None):
     """
     Read parquet file as PyArrow Table from S3/MinIO.
     
+    Only the requested column chunks are fetched; pre_buffer coalesces
+    them into concurrent range requests.
+    
     Args:
         bucket: S3 bucket name
         key: Object key (path) in bucket
@@ -111,41 +195,124 @@ def read_parquet_table_from_s3(bucket: str, key: str, columns: Optional[List[str
     Returns:
         PyArrow Table
     """
-    client = get_s3_client()
+    fs = get_s3_filesystem()
     
     logger.debug("Reading parquet table from S3", bucket=bucket, key=key)
     
-    response = client.get_object(Bucket=bucket, Key=key)
-    data = response['Body'].read()
+    return pq.read_table(
+        f"{bucket}/{key}",
+        columns=columns,
+        filesystem=fs,
+        use_threads=True,
+        pre_buffer=True,
+    )
+
+
+def read_parquet_batches_from_s3(
+    bucket: str,
+    key: str,
+    batch_size: int = 10000,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream parquet file from S3/MinIO as pandas DataFrame chunks.
     
-    parquet_file = pq.ParquetFile(io.BytesIO(data))
-    return parquet_file.read(columns=columns)
+    Each record batch is converted with self_destruct so its Arrow buffers
+    are released as soon as the chunk is materialized.
+    
+    Args:
+        bucket: S3 bucket name
+        key: Object key (path) in bucket
+        batch_size: Number of rows per chunk
+        columns: Optional list of columns to read
+        
+    Yields:
+        pandas DataFrame chunks
+    """
+    with read_parquet_from_s3(bucket, key) as parquet_file:
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas(self_destruct=True)
 
 
-def list_parquet_files(bucket: str, prefix: str) -> List[str]:
+def _iter_parquet_keys(bucket: str, prefix: str) -> Iterator[str]:
     """
-    List parquet files in S3 bucket with given prefix.
+    Yield parquet object keys page by page as the listing progresses.
     
     Args:
         bucket: S3 bucket name
         prefix: Key prefix to filter
         
-    Returns:
-        List of object keys ending in .parquet
+    Yields:
+        Object keys ending in .parquet
     """
     client = get_s3_client()
     paginator = client.get_paginator('list_objects_v2')
     
-    files = []
-    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={'PageSize': 1000}):
         for obj in page.get('Contents', []):
             if obj['Key'].endswith('.parquet'):
-                files.append(obj['Key'])
+                yield obj['Key']
+
+
+def list_parquet_files(bucket: str, prefix: str) -> List[str]:
+    """
+    List parquet files in S3 bucket with given prefix.
+    
+    Args:
+        bucket: S3 bucket name
+        prefix: Key prefix to filter
+        
+    Returns:
+        List of object keys ending in .parquet
+    """
+    files = list(_iter_parquet_keys(bucket, prefix))
     
     logger.debug("Listed parquet files", bucket=bucket, prefix=prefix, count=len(files))
     return files
 
 
+def read_parquet_tables_from_s3(
+    bucket: str, prefix: str, columns: Optional[List[str]] = None
+) -> Iterator[Tuple[str, pa.Table]]:
+    """
+    Read all parquet files under a prefix concurrently.
+    
+    Reads are submitted to a thread pool as soon as their keys are listed,
+    so fetching overlaps with the remaining listing pages. At most
+    max_workers * 2 reads are in flight, so completed tables are handed to
+    the caller instead of piling up in memory. All workers share the same
+    S3 client and filesystem connections.
+    
+    Args:
+        bucket: S3 bucket name
+        prefix: Key prefix to filter
+        columns: Optional list of columns to read
+        
+    Yields:
+        (key, PyArrow Table) tuples in listing order
+    """
+    config_dict = get_s3_config()
+    get_s3_filesystem()  # create the shared filesystem before the workers start
+    
+    max_workers = config_dict['max_workers']
+    max_in_flight = max_workers * 2
+    
+    logger.debug("Reading parquet files from S3", bucket=bucket, prefix=prefix, max_in_flight=max_in_flight)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Results come back in listing order (deterministic), whatever order the reads finish in
+        in_flight = deque()
+        for key in _iter_parquet_keys(bucket, prefix):
+            if len(in_flight) >= max_in_flight:
+                done_key, future = in_flight.popleft()
+                yield done_key, future.result()
+            in_flight.append((key, executor.submit(read_parquet_table_from_s3, bucket, key, columns)))
+        
+        while in_flight:
+            done_key, future = in_flight.popleft()
+            yield done_key, future.result()
+
+
 def check_s3_connectivity() -> bool:
     """
     Check if S3/MinIO is accessible.
@@ -18,13 +18,24 @@ Key Logic:
 Complexity: MEDIUM-HIGH (7/10)
 """
 
-import json
-from typing import Dict, List, Set
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Set, Tuple, Union
 
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from .utils import PerformanceTimer, get_logger
 
+# Distinct tag/label strings handed to each parse worker at a time
+TAG_PARSE_BATCH_SIZE = 1024
+
+# Arrow-backed strings for the matched_ocp_* columns (one UTF-8 buffer instead of Python objects)
+MATCHED_VALUE_DTYPE = "string[pyarrow]"
+
 
 class TagMatcher:
     """
@@ -51,27 +62,31 @@ class TagMatcher:
         """
         self.config = config
         self.logger = get_logger("tag_matcher")
+        self.parse_workers = config.get("performance", {}).get("tag_parse_workers", 1)
 
         self.logger.info("Initialized tag matcher")
 
     def extract_ocp_tag_values(
         self,
         cluster_id: str,
-        pod_usage_df: pd.DataFrame,
-        storage_usage_df: pd.DataFrame = None,
+        pod_usage_df: Union[pd.DataFrame, pa.Table],
+        storage_usage_df: Union[pd.DataFrame, pa.Table] = None,
         cluster_alias: str = None,
     ) -> Dict[str, Set[str]]:
         """
         Extract all unique OCP values for tag matching.
 
+        Both inputs may also be Arrow tables, in which case distinct values are
+        computed by Arrow kernels and only those are converted to Python strings.
+
         Args:
             cluster_id: OCP cluster ID
-            pod_usage_df: OCP pod usage DataFrame
-            storage_usage_df: OCP storage usage DataFrame (optional)
+            pod_usage_df: OCP pod usage DataFrame (or Arrow table)
+            storage_usage_df: OCP storage usage DataFrame or Arrow table (optional)
             cluster_alias: OCP cluster alias (optional)
 
         Returns:
-            Dictionary with sets of:
+            Dictionary with frozensets of:
                 - 'cluster_ids': Set of cluster IDs
                 - 'cluster_aliases': Set of cluster aliases
                 - 'node_names': Set of node names
@@ -89,10 +104,11 @@ class TagMatcher:
                 "volume_labels": set(),
             }
 
+            pod_columns = self._column_names(pod_usage_df)
+
             # Extract cluster IDs from data (multi-cluster support)
-            if not pod_usage_df.empty and "cluster_id" in pod_usage_df.columns:
-                cluster_ids = pod_usage_df["cluster_id"].dropna().unique()
-                tag_values["cluster_ids"] = set(cluster_ids)
+            if "cluster_id" in pod_columns:
+                tag_values["cluster_ids"] = self._unique_values(pod_usage_df["cluster_id"])
                 self.logger.info(
                     f"Extracted {len(tag_values['cluster_ids'])} unique cluster IDs from data: {sorted(tag_values['cluster_ids'])}"
                 )
@@ -102,15 +118,13 @@ class TagMatcher:
                 self.logger.info(f"Using cluster_id parameter (no cluster_id column in data): {cluster_id}")
 
             # Extract node names
-            if not pod_usage_df.empty and "node" in pod_usage_df.columns:
-                node_names = pod_usage_df["node"].dropna().unique()
-                tag_values["node_names"] = set(node_names)
+            if "node" in pod_columns:
+                tag_values["node_names"] = self._unique_values(pod_usage_df["node"])
                 self.logger.info(f"Extracted {len(tag_values['node_names'])} unique node names")
 
             # Extract namespaces
-            if not pod_usage_df.empty and "namespace" in pod_usage_df.columns:
-                namespaces = pod_usage_df["namespace"].dropna().unique()
-                tag_values["namespaces"] = set(namespaces)
+            if "namespace" in pod_columns:
+                tag_values["namespaces"] = self._unique_values(pod_usage_df["namespace"])
                 self.logger.info(f"Extracted {len(tag_values['namespaces'])} unique namespaces")
 
             # Extract cluster_aliases (Gap #1 fix)
@@ -119,40 +133,28 @@ class TagMatcher:
                 self.logger.info(f"Added cluster_alias: {cluster_alias}")
 
             # Extract pod_labels (Gap #2 - part 1)
-            if not pod_usage_df.empty and "pod_labels" in pod_usage_df.columns:
-                pod_label_count = 0
-                for labels_json in pod_usage_df["pod_labels"].dropna().unique():
-                    labels_dict = self.parse_ocp_labels(labels_json)
-                    for key, value in labels_dict.items():
-                        tag_values["pod_labels"].add(f"{key}={value}")
-                        pod_label_count += 1
+            if "pod_labels" in pod_columns:
+                tag_values["pod_labels"], pod_label_set_count = self._label_pairs([pod_usage_df["pod_labels"]])
 
                 self.logger.info(
-                    f"Extracted {pod_label_count} unique pod label key=value pairs from {len(pod_usage_df['pod_labels'].dropna().unique())} unique label sets"
+                    f"Extracted {len(tag_values['pod_labels'])} unique pod label key=value pairs "
+                    f"from {pod_label_set_count} unique label sets"
                 )
 
-            # Extract volume_labels (Gap #2 - part 2)
-            if storage_usage_df is not None and not storage_usage_df.empty:
-                volume_label_count = 0
-
-                # Extract from persistentvolume_labels
-                if "persistentvolume_labels" in storage_usage_df.columns:
-                    for labels_json in storage_usage_df["persistentvolume_labels"].dropna().unique():
-                        labels_dict = self.parse_ocp_labels(labels_json)
-                        for key, value in labels_dict.items():
-                            tag_values["volume_labels"].add(f"{key}={value}")
-                            volume_label_count += 1
-
-                # Extract from persistentvolumeclaim_labels
-                if "persistentvolumeclaim_labels" in storage_usage_df.columns:
-                    for labels_json in storage_usage_df["persistentvolumeclaim_labels"].dropna().unique():
-                        labels_dict = self.parse_ocp_labels(labels_json)
-                        for key, value in labels_dict.items():
-                            tag_values["volume_labels"].add(f"{key}={value}")
-                            volume_label_count += 1
+            # Extract volume_labels (Gap #2 - part 2) from persistentvolume_labels
+            # and persistentvolumeclaim_labels into one set
+            storage_columns = self._column_names(storage_usage_df)
+            if storage_columns:
+                volume_label_columns = [
+                    col for col in ("persistentvolume_labels", "persistentvolumeclaim_labels") if col in storage_columns
+                ]
+                tag_values["volume_labels"], volume_label_set_count = self._label_pairs(
+                    [storage_usage_df[col] for col in volume_label_columns]
+                )
 
                 self.logger.info(
-                    f"Extracted {volume_label_count} volume label key=value pairs, {len(tag_values['volume_labels'])} unique"
+                    f"Extracted {len(tag_values['volume_labels'])} unique volume label key=value pairs "
+                    f"from {volume_label_set_count} unique label sets"
                 )
 
             total_values = (
@@ -175,7 +177,46 @@ class TagMatcher:
                 total=total_values,
             )
 
-            return tag_values
+            # Frozen so match_by_tags can reuse them across calls without re-hashing
+            return {key: frozenset(values) for key, values in tag_values.items()}
+
+    @staticmethod
+    def _column_names(frame: Union[pd.DataFrame, pa.Table, None]) -> Set[str]:
+        """
+        Column names of a non-empty DataFrame or Arrow table.
+
+        Args:
+            frame: DataFrame, Arrow table or None
+
+        Returns:
+            Set of column names (empty when frame is None or has no rows)
+        """
+        if frame is None or len(frame) == 0:
+            return set()
+        return set(frame.column_names if isinstance(frame, pa.Table) else frame.columns)
+
+    @staticmethod
+    def _unique_values(series: Union[pd.Series, pa.ChunkedArray]) -> Set[str]:
+        """
+        Distinct non-null values of a column.
+
+        For categorical columns (node/namespace are loaded as categorical) this is
+        resolved on the integer codes, keeping only categories still in use. Arrow
+        columns are deduplicated by pyarrow.compute before leaving Arrow memory.
+
+        Args:
+            series: Column to scan (pandas Series or Arrow ChunkedArray)
+
+        Returns:
+            Set of distinct values
+        """
+        if isinstance(series, pa.ChunkedArray):
+            return set(pc.unique(pc.drop_null(series)).to_pylist())
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            used = np.unique(codes[codes >= 0])
+            return set(series.cat.categories[used])
+        return set(series.dropna().unique())
 
     def parse_ocp_labels(self, labels_json: str) -> Dict[str, str]:
         """
@@ -191,26 +232,29 @@ class TagMatcher:
         Returns:
             Dictionary of label key-value pairs
         """
-        if not labels_json or pd.isna(labels_json):
+        # Null-likes (None, NaN, pd.NA) are not str; cheaper than pd.isna per call
+        if not isinstance(labels_json, str) or not labels_json:
             return {}
 
-        try:
-            # Handle both JSON dict and pipe-separated format
-            if labels_json.startswith("{"):
-                # JSON format: {"app": "frontend"}
-                return json.loads(labels_json)
-            elif "|" in labels_json:
-                # Pipe format: app:frontend|tier:web
-                labels = {}
-                for pair in labels_json.split("|"):
-                    if ":" in pair:
-                        key, value = pair.split(":", 1)
-                        labels[key.strip()] = value.strip()
-                return labels
-            else:
+        # Handle both JSON dict and pipe-separated format
+        if labels_json[0] == "{":
+            # JSON format: {"app": "frontend"}; an unclosed object cannot parse, skip the exception
+            if labels_json[-1] != "}":
                 return {}
-        except (json.JSONDecodeError, ValueError) as e:
-            self.logger.debug(f"Failed to parse OCP labels: {e}")
+            try:
+                return orjson.loads(labels_json)
+            except orjson.JSONDecodeError as e:
+                self.logger.debug(f"Failed to parse OCP labels: {e}")
+                return {}
+        elif "|" in labels_json:
+            # Pipe format: app:frontend|tier:web
+            labels = {}
+            for pair in labels_json.split("|"):
+                if ":" in pair:
+                    key, value = pair.split(":", 1)
+                    labels[key.strip()] = value.strip()
+            return labels
+        else:
             return {}
 
     def parse_aws_tags(self, tags_json: str) -> Dict[str, str]:
@@ -223,17 +267,77 @@ class TagMatcher:
         Returns:
             Dictionary of tags, or empty dict if parsing fails
         """
-        if pd.isna(tags_json) or tags_json == "" or tags_json == "{}":
+        # Null-likes (None, NaN, pd.NA) are not str; cheaper than pd.isna per call
+        if not isinstance(tags_json, str) or tags_json == "" or tags_json == "{}":
+            return {}
+
+        # Only a JSON object can yield tags; anything else is rejected without raising
+        if tags_json[0] != "{" or tags_json[-1] != "}":
             return {}
 
         try:
-            tags = json.loads(tags_json)
-            if not isinstance(tags, dict):
-                return {}
-            return tags
-        except (json.JSONDecodeError, TypeError) as e:
+            tags = orjson.loads(tags_json)
+        except orjson.JSONDecodeError as e:
             self.logger.debug(f"Failed to parse AWS tags: {e}")
             return {}
+        return tags
+
+    def _parse_all(self, parse: Callable[[str], Dict[str, str]], values: Iterable[str]) -> List[Dict[str, str]]:
+        """
+        Parse distinct tag/label strings, in batches on a thread pool when configured.
+
+        Args:
+            parse: Parser for a single string (parse_aws_tags or parse_ocp_labels)
+            values: Distinct strings to parse
+
+        Returns:
+            List of parsed dictionaries, in the order of values
+        """
+        values = list(values)
+        if self.parse_workers <= 1 or len(values) <= TAG_PARSE_BATCH_SIZE:
+            return [parse(value) for value in values]
+
+        batches = [values[i : i + TAG_PARSE_BATCH_SIZE] for i in range(0, len(values), TAG_PARSE_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=self.parse_workers) as executor:
+            return list(chain.from_iterable(executor.map(lambda batch: [parse(value) for value in batch], batches)))
+
+    def _label_pairs(self, label_columns: List[Union[pd.Series, pa.ChunkedArray]]) -> Tuple[Set[str], int]:
+        """
+        Collect the distinct "key=value" label pairs of one or more OCP label columns.
+
+        Each distinct label string is parsed once, even if it appears in several
+        columns (PV and PVC labels are often identical), and the pairs are built
+        with one vectorized string concatenation.
+
+        Args:
+            label_columns: Label columns (JSON or pipe-separated strings)
+
+        Returns:
+            Tuple of (set of "key=value" strings, number of distinct label strings parsed)
+        """
+        unique_labels = set().union(*(self._unique_values(column) for column in label_columns))
+        label_sets = self._parse_all(self.parse_ocp_labels, unique_labels)
+        keys = pd.Series(list(chain.from_iterable(label_sets)), dtype=object)
+        values = pd.Series(list(chain.from_iterable(labels.values() for labels in label_sets)), dtype=object)
+        return set((keys.astype(str) + "=" + values.astype(str)).unique()), len(unique_labels)
+
+    def _generic_tag_strings(self, tag_sets: pd.Series) -> pd.Series:
+        """
+        Flatten tag dicts into "key=value" strings, skipping special OpenShift tags.
+
+        Args:
+            tag_sets: Series of AWS tag dictionaries
+
+        Returns:
+            Series of "key=value" strings indexed by the tag set's index label,
+            in tag order within each set
+        """
+        index = np.repeat(tag_sets.index.to_numpy(), [len(tags) for tags in tag_sets])
+        keys = pd.Series(list(chain.from_iterable(tag_sets)), index=index, dtype=object)
+        values = pd.Series(list(chain.from_iterable(tags.values() for tags in tag_sets)), index=index, dtype=object)
+
+        is_generic = ~keys.isin(self.SPECIAL_TAGS).to_numpy()
+        return keys[is_generic] + "=" + values[is_generic].astype(str)
 
     def filter_by_enabled_keys(self, aws_tags: Dict[str, str], enabled_keys: Set[str]) -> Dict[str, str]:
         """
@@ -256,13 +360,20 @@ class TagMatcher:
             # If no enabled keys specified, allow all
             return aws_tags
 
-        return {k: v for k, v in aws_tags.items() if k in enabled_keys}
+        # Set intersection runs in C; keep the tag order (first generic match wins)
+        kept_keys = aws_tags.keys() & enabled_keys
+        if len(kept_keys) == len(aws_tags):
+            return aws_tags
+        if not kept_keys:
+            return {}
+        return {k: v for k, v in aws_tags.items() if k in kept_keys}
 
     def match_by_tags(
         self,
         aws_df: pd.DataFrame,
         ocp_tag_values: Dict[str, Set[str]],
         enabled_keys: Set[str] = None,
+        copy: bool = False,
     ) -> pd.DataFrame:
         """
         Match AWS resources to OCP by tags.
@@ -285,27 +396,27 @@ class TagMatcher:
             aws_df: AWS line items DataFrame with 'resourcetags' column
             ocp_tag_values: Dictionary of OCP values to match against
             enabled_keys: Set of enabled tag keys (None = allow all)
+            copy: Work on a copy of aws_df instead of adding the columns to it in place
 
         Returns:
-            DataFrame with added columns:
+            DataFrame with added columns (aws_df itself unless copy=True):
                 - 'tag_matched': Boolean indicating if matched by tags
-                - 'matched_tag': The tag that matched (e.g., 'openshift_cluster=my-cluster')
-                - 'matched_ocp_cluster': OCP cluster ID that matched
-                - 'matched_ocp_node': OCP node name that matched
-                - 'matched_ocp_namespace': OCP namespace that matched
+                - 'matched_tag': The tag that matched (e.g., 'openshift_cluster=my-cluster'), categorical
+                - 'matched_ocp_cluster': OCP cluster ID that matched (string[pyarrow])
+                - 'matched_ocp_node': OCP node name that matched (string[pyarrow])
+                - 'matched_ocp_namespace': OCP namespace that matched (string[pyarrow])
         """
         with PerformanceTimer("Match AWS resources by tags", self.logger):
-            # Create a copy to avoid modifying original
-            aws_df = aws_df.copy()
-
-            # Initialize tag matching columns (required even for empty DataFrames)
-            aws_df["tag_matched"] = False
-            aws_df["matched_tag"] = None
-            aws_df["matched_ocp_cluster"] = None
-            aws_df["matched_ocp_node"] = None
-            aws_df["matched_ocp_namespace"] = None
+            # Columns are added in place; the aggregator hands over a frame it owns
+            if copy:
+                aws_df = aws_df.copy()
 
             if aws_df.empty:
+                # Tag matching columns are required even for empty DataFrames
+                aws_df["tag_matched"] = False
+                aws_df["matched_tag"] = None
+                for column in ("matched_ocp_cluster", "matched_ocp_node", "matched_ocp_namespace"):
+                    aws_df[column] = pd.array([], dtype=MATCHED_VALUE_DTYPE)
                 self.logger.warning("AWS DataFrame is empty, no matching possible")
                 return aws_df
 
@@ -313,6 +424,16 @@ class TagMatcher:
             if "resourcetags" not in aws_df.columns:
                 raise ValueError("AWS DataFrame missing 'resourcetags' column")
 
+            # Look the OCP value sets up once (frozenset() is a no-op for extract_ocp_tag_values output)
+            cluster_ids = frozenset(ocp_tag_values["cluster_ids"])
+            cluster_aliases = frozenset(ocp_tag_values.get("cluster_aliases") or ())
+            node_names = frozenset(ocp_tag_values["node_names"])
+            namespaces = frozenset(ocp_tag_values["namespaces"])
+            label_sets = {
+                "pod_labels": frozenset(ocp_tag_values.get("pod_labels") or ()),
+                "volume_labels": frozenset(ocp_tag_values.get("volume_labels") or ()),
+            }
+
             # Track matching statistics
             stats = {
                 "total_aws_resources": len(aws_df),
@@ -336,129 +457,121 @@ class TagMatcher:
 
             self.logger.info(f"Starting tag matching for {len(aws_df)} AWS resources")
 
-            # Iterate through AWS resources
-            for idx, row in aws_df.iterrows():
-                # Skip if already matched by resource ID
-                if "resource_id_matched" in row and row["resource_id_matched"]:
-                    continue
-
-                # Skip if already matched by tag (in case of duplicate processing)
-                if row["tag_matched"]:
-                    continue
-
-                # Parse AWS tags
-                tags_json = row["resourcetags"]
-                aws_tags = self.parse_aws_tags(tags_json)
-
-                if not aws_tags:
-                    stats["tags_failed_to_parse"] += 1
-                    continue
-
-                stats["tags_parsed"] += 1
-
-                # Filter by enabled keys
-                if enabled_keys:
-                    aws_tags = self.filter_by_enabled_keys(aws_tags, enabled_keys)
-
-                if not aws_tags:
-                    continue
-
-                # Check for special OpenShift tags
-                matched = False
-                matched_tag_str = None
-
-                # Priority 1: Cluster tag (matches cluster_id OR cluster_alias)
-                if self.TAG_OPENSHIFT_CLUSTER in aws_tags:
-                    cluster_value = aws_tags[self.TAG_OPENSHIFT_CLUSTER]
-
-                    # Check against cluster_id
-                    if cluster_value in ocp_tag_values["cluster_ids"]:
-                        aws_df.at[idx, "tag_matched"] = True
-                        aws_df.at[idx, "matched_tag"] = f"{self.TAG_OPENSHIFT_CLUSTER}={cluster_value}"
-                        aws_df.at[idx, "matched_ocp_cluster"] = cluster_value
-                        stats["matched_by_cluster_tag"] += 1
-                        matched = True
-                        matched_tag_str = f"{self.TAG_OPENSHIFT_CLUSTER}={cluster_value}"
-
-                    # Also check against cluster_alias (Gap #1 fix)
-                    elif cluster_value in ocp_tag_values.get("cluster_aliases", set()):
-                        aws_df.at[idx, "tag_matched"] = True
-                        aws_df.at[idx, "matched_tag"] = f"{self.TAG_OPENSHIFT_CLUSTER}={cluster_value} (alias)"
-                        aws_df.at[idx, "matched_ocp_cluster"] = cluster_value
-                        stats["matched_by_cluster_alias"] += 1
-                        matched = True
-                        matched_tag_str = f"{self.TAG_OPENSHIFT_CLUSTER}={cluster_value} (alias)"
-
-                # Priority 2: Node tag
-                if not matched and self.TAG_OPENSHIFT_NODE in aws_tags:
-                    node_value = aws_tags[self.TAG_OPENSHIFT_NODE]
-                    if node_value in ocp_tag_values["node_names"]:
-                        aws_df.at[idx, "tag_matched"] = True
-                        aws_df.at[idx, "matched_tag"] = f"{self.TAG_OPENSHIFT_NODE}={node_value}"
-                        aws_df.at[idx, "matched_ocp_node"] = node_value
-                        stats["matched_by_node_tag"] += 1
-                        matched = True
-                        matched_tag_str = f"{self.TAG_OPENSHIFT_NODE}={node_value}"
-
-                # Priority 3: Project/Namespace tag
-                if not matched and self.TAG_OPENSHIFT_PROJECT in aws_tags:
-                    namespace_value = aws_tags[self.TAG_OPENSHIFT_PROJECT]
-                    if namespace_value in ocp_tag_values["namespaces"]:
-                        aws_df.at[idx, "tag_matched"] = True
-                        aws_df.at[idx, "matched_tag"] = f"{self.TAG_OPENSHIFT_PROJECT}={namespace_value}"
-                        aws_df.at[idx, "matched_ocp_namespace"] = namespace_value
-                        stats["matched_by_namespace_tag"] += 1
-                        matched = True
-                        matched_tag_str = f"{self.TAG_OPENSHIFT_PROJECT}={namespace_value}"
-
-                # Priority 4: Generic tags matched against pod_labels (Gap #2 - part 1)
-                # Trino SQL line 9: any_match(..., x->strpos(ocp.pod_labels, ...) != 0)
-                if not matched:
-                    for tag_key, tag_value in aws_tags.items():
-                        # Skip special OpenShift tags (already checked above)
-                        if tag_key in [
-                            self.TAG_OPENSHIFT_CLUSTER,
-                            self.TAG_OPENSHIFT_NODE,
-                            self.TAG_OPENSHIFT_PROJECT,
-                        ]:
-                            continue
-
-                        # Check if this tag appears in pod_labels
-                        tag_str = f"{tag_key}={tag_value}"
-                        if tag_str in ocp_tag_values.get("pod_labels", set()):
-                            aws_df.at[idx, "tag_matched"] = True
-                            aws_df.at[idx, "matched_tag"] = f"{tag_str} (pod_labels)"
-                            aws_df.at[idx, "match_type"] = "pod_labels"
-                            stats["matched_by_pod_labels"] += 1
-                            matched = True
-                            matched_tag_str = f"{tag_str} (pod_labels)"
-                            break
-
-                # Priority 5: Generic tags matched against volume_labels (Gap #2 - part 2)
-                # Trino SQL line 10: any_match(..., x->strpos(ocp.volume_labels, ...) != 0)
-                if not matched:
-                    for tag_key, tag_value in aws_tags.items():
-                        # Skip special OpenShift tags
-                        if tag_key in [
-                            self.TAG_OPENSHIFT_CLUSTER,
-                            self.TAG_OPENSHIFT_NODE,
-                            self.TAG_OPENSHIFT_PROJECT,
-                        ]:
-                            continue
-
-                        # Check if this tag appears in volume_labels
-                        tag_str = f"{tag_key}={tag_value}"
-                        if tag_str in ocp_tag_values.get("volume_labels", set()):
-                            aws_df.at[idx, "tag_matched"] = True
-                            aws_df.at[idx, "matched_tag"] = f"{tag_str} (volume_labels)"
-                            aws_df.at[idx, "match_type"] = "volume_labels"
-                            stats["matched_by_volume_labels"] += 1
-                            matched = True
-                            matched_tag_str = f"{tag_str} (volume_labels)"
-                            break
-
-                if matched:
-                    self.logger.debug(f"Matched AWS resource by tag: {matched_tag_str}")
+            # Only resources NOT already matched by resource ID are candidates, and
+            # only those with a resourcetags value need any work at all
+            if "resource_id_matched" in aws_df.columns:
+                candidates = ~aws_df["resource_id_matched"].fillna(False).astype(bool).to_numpy()
+            else:
+                candidates = np.ones(len(aws_df), dtype=bool)
+            n_candidates = int(np.count_nonzero(candidates))
+            positions = np.flatnonzero(candidates & aws_df["resourcetags"].notna().to_numpy())
+
+            # Tags repeat across line items (the same resource is billed hourly), so
+            # matching runs once per distinct resourcetags string and is expanded to
+            # the tagged candidate rows through the factorized codes at the end. The
+            # extra trailing empty tag set keeps the per-set arrays non-empty.
+            codes, unique_tags = pd.factorize(aws_df["resourcetags"].iloc[positions])
+            parsed = self._parse_all(self.parse_aws_tags, unique_tags) + [{}]
+            has_tags = np.array([bool(tags) for tags in parsed])
+            if enabled_keys:
+                parsed = [self.filter_by_enabled_keys(tags, enabled_keys) for tags in parsed]
+            aws_tags = pd.Series(parsed, dtype=object)
+
+            # One pass over the tag sets pulls all three OpenShift tags (a single get each)
+            openshift_tags = (self.TAG_OPENSHIFT_CLUSTER, self.TAG_OPENSHIFT_NODE, self.TAG_OPENSHIFT_PROJECT)
+            cluster_values, node_values, namespace_values = (
+                pd.Series(values, dtype=object)
+                for values in zip(*([tags.get(key) for key in openshift_tags] for tags in parsed))
+            )
+
+            # Priority 1: Cluster tag (matches cluster_id, else cluster_alias - Gap #1 fix)
+            # Priority 2: Node tag, Priority 3: Project/Namespace tag
+            has_cluster = cluster_values.notna().to_numpy()
+            by_cluster = has_cluster & cluster_values.isin(cluster_ids).to_numpy()
+            by_cluster_alias = has_cluster & ~by_cluster & cluster_values.isin(cluster_aliases).to_numpy()
+            matched = by_cluster | by_cluster_alias
+            by_node = ~matched & node_values.notna().to_numpy() & node_values.isin(node_names).to_numpy()
+            matched |= by_node
+            by_namespace = ~matched & namespace_values.notna().to_numpy() & namespace_values.isin(namespaces).to_numpy()
+            matched |= by_namespace
+
+            # Priority 4/5: Generic tags matched against pod_labels, then volume_labels (Gap #2)
+            # Trino SQL lines 9-10: any_match(..., x->strpos(ocp.pod_labels / ocp.volume_labels, ...) != 0)
+            # There x is a quoted '"key": "value"' pair searched in the labels JSON, so the strpos
+            # finds whole key/value pairs; exact "key=value" membership in the hashed label sets
+            # is the same match in one O(tags + labels) isin, with no substring scan needed.
+            generic_tags = self._generic_tag_strings(aws_tags[~matched & has_tags])
+            label_matches = {}
+            for label_source, labels in label_sets.items():
+                label_tag = pd.Series(None, index=aws_tags.index, dtype=object)
+                if labels and not generic_tags.empty:
+                    # First tag (in tag order) of each still-unmatched tag set found in the labels
+                    hits = generic_tags[generic_tags.isin(labels).to_numpy() & ~matched[generic_tags.index]]
+                    first_hits = hits.groupby(level=0, sort=False).first()
+                    label_tag[first_hits.index] = first_hits
+                by_label = label_tag.notna().to_numpy()
+                matched |= by_label
+                label_matches[label_source] = (by_label, label_tag)
+
+            by_pod_labels, pod_label_tag = label_matches["pod_labels"]
+            by_volume_labels, volume_label_tag = label_matches["volume_labels"]
+
+            cluster_tag = f"{self.TAG_OPENSHIFT_CLUSTER}=" + cluster_values.astype(str)
+            matched_tag = np.select(
+                [by_cluster, by_cluster_alias, by_node, by_namespace, by_pod_labels, by_volume_labels],
+                [
+                    cluster_tag,
+                    cluster_tag + " (alias)",
+                    f"{self.TAG_OPENSHIFT_NODE}=" + node_values.astype(str),
+                    f"{self.TAG_OPENSHIFT_PROJECT}=" + namespace_values.astype(str),
+                    pod_label_tag + " (pod_labels)",
+                    volume_label_tag + " (volume_labels)",
+                ],
+                default=None,
+            )
+
+            stats["tags_parsed"] = int(np.count_nonzero(has_tags[codes]))
+            stats["tags_failed_to_parse"] = n_candidates - stats["tags_parsed"]
+            stats["matched_by_cluster_tag"] = int(np.count_nonzero(by_cluster[codes]))
+            stats["matched_by_cluster_alias"] = int(np.count_nonzero(by_cluster_alias[codes]))
+            stats["matched_by_node_tag"] = int(np.count_nonzero(by_node[codes]))
+            stats["matched_by_namespace_tag"] = int(np.count_nonzero(by_namespace[codes]))
+            stats["matched_by_pod_labels"] = int(np.count_nonzero(by_pod_labels[codes]))
+            stats["matched_by_volume_labels"] = int(np.count_nonzero(by_volume_labels[codes]))
+
+            def scatter(target: np.ndarray, values, mask: np.ndarray) -> np.ndarray:
+                """Write per-tag-set ``values`` into ``target`` at candidate rows where ``mask`` holds."""
+                row_mask = mask[codes]
+                target[positions[row_mask]] = np.asarray(values, dtype=target.dtype)[codes][row_mask]
+                return target
+
+            # Each result column is built as a whole array and assigned once
+            n_rows = len(aws_df)
+            aws_df["tag_matched"] = scatter(np.zeros(n_rows, dtype=bool), matched, matched)
+            # At most one tag string per distinct tag set, so rows only carry categorical
+            # codes into those strings (unmatched sets select None and factorize to -1)
+            tag_codes, matched_tags = pd.factorize(matched_tag)
+            row_codes = np.full(n_rows, -1, dtype=tag_codes.dtype)
+            row_codes[positions] = tag_codes[codes]
+            aws_df["matched_tag"] = pd.Categorical.from_codes(row_codes, categories=matched_tags)
+            for column, values, mask in (
+                ("matched_ocp_cluster", cluster_values, by_cluster | by_cluster_alias),
+                ("matched_ocp_node", node_values, by_node),
+                ("matched_ocp_namespace", namespace_values, by_namespace),
+            ):
+                matched_values = scatter(np.full(n_rows, None, dtype=object), values, mask)
+                aws_df[column] = pd.array(matched_values, dtype=MATCHED_VALUE_DTYPE)
+
+            by_label = by_pod_labels | by_volume_labels
+            if by_label.any():
+                if "match_type" in aws_df.columns:
+                    match_type = aws_df["match_type"].to_numpy(dtype=object, copy=True)
+                else:
+                    match_type = np.full(n_rows, np.nan, dtype=object)
+                label_source = np.where(by_pod_labels, "pod_labels", "volume_labels")
+                aws_df["match_type"] = scatter(match_type, label_source, by_label)
+
+            self.logger.debug(f"Matched {int(np.count_nonzero(matched[codes]))} AWS resources by tag")
 
             # Calculate total matched
             stats["total_tag_matched"] = aws_df["tag_matched"].sum()
@@ -191,6 +191,21 @@ class TestAWSDataLoader:
             assert len(result) == 2  # 2 EC2 instances (both have resource IDs)
             assert (result["lineitem_productcode"] == "AmazonEC2").all()
 
+    def test_read_aws_line_items_for_matching_nothing_left_after_filter(self, mock_config, sample_aws_cur_data):
+        """Test filtering every row out returns an empty DataFrame."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+            loader.read_aws_line_items_daily = Mock(return_value=sample_aws_cur_data)
+
+            result = loader.read_aws_line_items_for_matching(
+                provider_uuid="test-provider",
+                year="2025",
+                month="10",
+                resource_types=["AmazonRDS"],
+            )
+
+            assert result.empty
+
     def test_read_aws_line_items_for_matching_empty(self, mock_config):
         """Test reading AWS CUR for matching with no data."""
         with patch("src.aws_data_loader.ParquetReader"):
@@ -203,6 +218,70 @@ class TestAWSDataLoader:
 
             assert result.empty
 
+    def test_read_aws_line_items_for_matching_pushes_down_filters(self, mock_config, sample_aws_cur_data):
+        """Test resource filters are pushed down into the Parquet scan."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+            loader.read_aws_line_items_daily = Mock(return_value=sample_aws_cur_data)
+
+            loader.read_aws_line_items_for_matching(
+                provider_uuid="test-provider",
+                year="2025",
+                month="10",
+                resource_types=["AmazonEC2"],
+            )
+
+            filters = loader.read_aws_line_items_daily.call_args[1]["filters"]
+            assert "lineitem_resourceid" in str(filters)
+            assert "lineitem_productcode" in str(filters)
+
+    def test_resolve_aws_cur_columns_discovers_tag_columns(self, mock_config):
+        """Test column projection includes resourceTags/* columns from every file schema."""
+        import pyarrow as pa
+
+        with patch("src.aws_data_loader.ParquetReader") as mock_reader_class:
+            mock_reader = MagicMock()
+            mock_reader.read_parquet_schema.side_effect = [
+                pa.schema([("lineitem_resourceid", pa.string()), ("resourceTags/user:app", pa.string())]),
+                pa.schema([("lineitem_resourceid", pa.string()), ("resourceTags/user:env", pa.string())]),
+                pa.schema([("bill_invoiceid", pa.string()), ("openshift_cluster", pa.string())]),
+            ]
+            mock_reader_class.return_value = mock_reader
+
+            loader = AWSDataLoader(mock_config)
+            columns = loader._resolve_aws_cur_columns(["s3://b/f1.parquet", "s3://b/f2.parquet", "s3://b/f3.parquet"])
+
+            assert columns == [
+                "lineitem_resourceid",
+                "resourceTags/user:app",
+                "resourceTags/user:env",
+                "openshift_cluster",
+            ]
+
+    def test_read_skips_files_by_product_code_statistics(self, mock_config):
+        """Test files whose footer statistics exclude the product codes are not read."""
+        with patch("src.aws_data_loader.ParquetReader") as mock_reader_class:
+            mock_reader = MagicMock()
+            mock_reader.list_parquet_files.return_value = ["s3://b/ec2.parquet", "s3://b/rds.parquet"]
+            mock_reader.file_may_contain.side_effect = lambda file, column, values: file == "s3://b/ec2.parquet"
+            mock_reader._read_files_parallel.return_value = pd.DataFrame()
+            mock_reader_class.return_value = mock_reader
+
+            loader = AWSDataLoader(mock_config)
+            loader.read_aws_line_items_daily(
+                provider_uuid="test", year="2025", month="10", resource_types=["AmazonEC2"]
+            )
+
+            assert mock_reader._read_files_parallel.call_args[0][0] == ["s3://b/ec2.parquet"]
+
+    def test_resolve_aws_cur_columns_disabled(self, mock_config):
+        """Test all columns are read when column filtering is disabled."""
+        mock_config["performance"]["column_filtering"] = False
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            assert loader._resolve_aws_cur_columns(["s3://b/f1.parquet"]) is None
+
     def test_s3_path_construction(self, mock_config):
         """Test S3 path construction with variable substitution."""
         with patch("src.aws_data_loader.ParquetReader") as mock_reader_class:
@@ -251,7 +330,7 @@ class TestAWSDataLoader:
             loader.read_aws_line_items_daily(provider_uuid="test", year="2025", month="10")
 
             # Verify _read_files_parallel was called
-            # Note: columns=None because we read all columns for resourcetags consolidation
+            # Note: columns are resolved from the file schemas (optimal + resourceTags/*)
             call_args = mock_reader._read_files_parallel.call_args
             assert call_args is not None
 
@@ -285,6 +364,48 @@ class TestAWSDataLoader:
             assert len(chunks) == 2
             assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
 
+    def test_streaming_chunks_bounded_by_chunk_size(self, mock_config, sample_aws_cur_data, tmp_path):
+        """Test streaming reads a real Parquet file in chunks of at most chunk_size rows."""
+        import fsspec
+
+        data = pd.concat([sample_aws_cur_data] * 50, ignore_index=True)
+        data.to_parquet(tmp_path / "cur.parquet", row_group_size=40)
+
+        loader = AWSDataLoader(mock_config)
+        loader.parquet_reader.fs = fsspec.filesystem("file")
+        loader.parquet_reader.list_parquet_files = Mock(return_value=[f"s3://{tmp_path}/cur.parquet"])
+
+        chunks = list(
+            loader.read_aws_line_items_daily(
+                provider_uuid="test", year="2025", month="10", streaming=True, chunk_size=30
+            )
+        )
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 30 for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == len(data)
+
+    def test_dataset_read_loads_low_cardinality_columns_as_categorical(
+        self, mock_config, sample_aws_cur_data, tmp_path
+    ):
+        """Test the dataset scan returns CUR dimension columns as categoricals across files."""
+        import fsspec
+
+        sample_aws_cur_data.iloc[:1].to_parquet(tmp_path / "a.parquet")
+        sample_aws_cur_data.iloc[1:].to_parquet(tmp_path / "b.parquet")
+
+        loader = AWSDataLoader(mock_config)
+        loader.parquet_reader.fs = fsspec.filesystem("file")
+        loader.parquet_reader.list_parquet_files = Mock(
+            return_value=[f"s3://{tmp_path}/a.parquet", f"s3://{tmp_path}/b.parquet"]
+        )
+
+        result = loader.read_aws_line_items_daily(provider_uuid="test", year="2025", month="10")
+
+        assert isinstance(result["lineitem_productcode"].dtype, pd.CategoricalDtype)
+        assert sorted(result["lineitem_productcode"]) == sorted(sample_aws_cur_data["lineitem_productcode"])
+        assert result["lineitem_resourceid"].dtype == "object"
+
     # ========================================================================
     # PRODUCTION SCALE & EDGE CASE TESTS (8 new tests for 95% confidence)
     # ========================================================================
@@ -496,6 +617,172 @@ class TestAWSDataLoader:
             # Check resourcetags column exists
             assert "resourcetags" in result.columns
 
+    @pytest.mark.parametrize("use_arrow_compute", [False, True])
+    def test_consolidate_resource_tags_matches_json_dumps(self, mock_config, use_arrow_compute):
+        """Test consolidated tags have the per-row json.dumps layout (UTF-8 kept)."""
+        import json
+
+        mock_config["performance"]["use_arrow_compute"] = use_arrow_compute
+
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            df = pd.DataFrame(
+                {
+                    "lineitem_resourceid": ["i-1", "i-2", "i-3", "i-4"],
+                    "resourceTags/user:app": ["web", None, "", 'quo"te'],
+                    "resourceTags/user:env": ["prod", "dev", None, "café"],
+                    "openshift_project": [None, "backend", "", "ns\\1"],
+                }
+            )
+
+            result = loader._consolidate_resource_tags(df)
+
+            assert list(result["resourcetags"]) == [
+                json.dumps({"user:app": "web", "user:env": "prod"}),
+                json.dumps({"user:env": "dev", "openshift_project": "backend"}),
+                "{}",
+                json.dumps(
+                    {"user:app": 'quo"te', "user:env": "café", "openshift_project": "ns\\1"}, ensure_ascii=False
+                ),
+            ]
+            assert "resourceTags/user:app" not in result.columns
+            assert "openshift_project" not in result.columns
+
+    def test_consolidate_resource_tags_requires_prefix_at_start(self, mock_config):
+        """Test only columns starting with resourceTags/ are treated as tag columns."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            df = pd.DataFrame({"resourceTags/user:app": ["web"], "legacy_resourceTags/user:app": ["old"]})
+
+            result = loader._consolidate_resource_tags(df)
+
+            assert list(result["resourcetags"]) == ['{"user:app": "web"}']
+            assert list(result["legacy_resourceTags/user:app"]) == ["old"]
+
+    def test_detect_network_costs_directions(self, mock_config):
+        """Test data transfer direction detection (Trino precedence rules)."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            df = pd.DataFrame(
+                {
+                    "lineitem_productcode": ["AmazonEC2"] * 5 + ["AmazonS3", "AmazonEC2"],
+                    "product_productfamily": ["Data Transfer"] * 6 + ["Compute Instance"],
+                    "lineitem_usagetype": [
+                        "USE1-DataTransfer-In-Bytes",
+                        "USE1-DataTransfer-Out-Bytes",
+                        "USE1-DataTransfer-Regional-Bytes",
+                        "USE1-DataTransfer-Regional-Bytes",
+                        None,
+                        "USE1-DataTransfer-In-Bytes",
+                        "BoxUsage:m5.large",
+                    ],
+                    "lineitem_operation": ["RunInstances", None, "InterZone-In", "InterZone-Out", "", "", ""],
+                }
+            )
+
+            result = loader._detect_network_costs(df)
+
+            assert result["data_transfer_direction"].array.equals(
+                pd.Categorical(["IN", "OUT", "IN", "OUT", None, None, None], categories=["IN", "OUT"])
+            )
+
+    def test_detect_network_costs_without_operation_column(self, mock_config):
+        """Test regional rows get no direction when lineitem_operation is absent."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            df = pd.DataFrame(
+                {
+                    "lineitem_productcode": ["AmazonEC2"] * 3,
+                    "product_productfamily": ["Data Transfer"] * 3,
+                    "lineitem_usagetype": [
+                        "USE1-DataTransfer-In-Bytes",
+                        "USE1-DataTransfer-Out-Bytes",
+                        "USE1-DataTransfer-Regional-Bytes",
+                    ],
+                }
+            )
+
+            result = loader._detect_network_costs(df)
+
+            assert result["data_transfer_direction"].array.equals(
+                pd.Categorical(["IN", "OUT", None], categories=["IN", "OUT"])
+            )
+
+    def test_optimize_aws_cur_memory(self, mock_config, sample_aws_cur_data):
+        """Test low-cardinality CUR strings become categorical while costs keep float64."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            result = loader._optimize_aws_cur_memory(sample_aws_cur_data.copy())
+
+            assert isinstance(result["lineitem_productcode"].dtype, pd.CategoricalDtype)
+            assert isinstance(result["product_region"].dtype, pd.CategoricalDtype)
+            assert result["lineitem_resourceid"].dtype == "object"
+            assert result["lineitem_unblendedcost"].dtype == "float64"
+            assert result["lineitem_blendedcost"].dtype == "float64"
+            assert result["lineitem_usageamount"].dtype == "float32"
+            assert (result["lineitem_productcode"] == "AmazonEC2").sum() == 2
+
+    @pytest.mark.parametrize("categorical", [False, True])
+    def test_handle_savings_plan_costs(self, mock_config, categorical):
+        """Test COST-5098 zeroing and calculated amortized cost selection."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            df = pd.DataFrame(
+                {
+                    "lineitem_lineitemtype": ["Usage", "Tax", "SavingsPlanCoveredUsage", "SavingsPlanCoveredUsage"],
+                    "lineitem_unblendedcost": [1.0, 0.5, 2.0, 3.0],
+                    "lineitem_blendedcost": [1.0, 0.5, 2.0, 3.0],
+                    "savingsplan_savingsplaneffectivecost": [0.0, 0.0, 1.5, None],
+                }
+            )
+            if categorical:
+                df["lineitem_lineitemtype"] = df["lineitem_lineitemtype"].astype("category")
+
+            result = loader._handle_savings_plan_costs(df)
+
+            assert list(result["lineitem_unblendedcost"]) == [1.0, 0.5, 0.0, 3.0]
+            assert list(result["lineitem_blendedcost"]) == [1.0, 0.5, 0.0, 3.0]
+            assert list(result["lineitem_calculated_amortizedcost"][:3]) == [1.0, 0.5, 1.5]
+            assert pd.isna(result["lineitem_calculated_amortizedcost"].iloc[3])
+
+    @pytest.mark.parametrize("categorical", [False, True])
+    @pytest.mark.parametrize(
+        "line_item_types,expected_amortized",
+        [
+            (["Usage", "Tax", "Usage"], [1.0, 0.5, 2.0]),
+            (["DiscountedUsage", "Fee", None], [0.1, 0.2, 0.3]),
+            (["Usage", "Tax", None], [1.0, 0.5, 0.3]),
+        ],
+    )
+    def test_handle_savings_plan_costs_without_savings_plans(
+        self, mock_config, categorical, line_item_types, expected_amortized
+    ):
+        """Test amortized cost when no rows are SavingsPlanCoveredUsage."""
+        with patch("src.aws_data_loader.ParquetReader"):
+            loader = AWSDataLoader(mock_config)
+
+            df = pd.DataFrame(
+                {
+                    "lineitem_lineitemtype": line_item_types,
+                    "lineitem_unblendedcost": [1.0, 0.5, 2.0],
+                    "lineitem_blendedcost": [1.0, 0.5, 2.0],
+                    "savingsplan_savingsplaneffectivecost": [0.1, 0.2, 0.3],
+                }
+            )
+            if categorical:
+                df["lineitem_lineitemtype"] = df["lineitem_lineitemtype"].astype("category")
+
+            result = loader._handle_savings_plan_costs(df)
+
+            assert list(result["lineitem_unblendedcost"]) == [1.0, 0.5, 2.0]
+            assert list(result["lineitem_calculated_amortizedcost"]) == expected_amortized
+
     def test_streaming_performance_100k(self, mock_config):
         """Test streaming mode with 100K rows."""
         with patch("src.aws_data_loader.ParquetReader") as mock_reader_class:
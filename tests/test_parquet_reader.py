@@ -0,0 +1,153 @@
+"""
+Unit tests for Parquet Reader
+
+Tests the ParquetReader helpers against local Parquet files (no S3 required).
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.parquet_reader import ParquetReader
+
+
+@pytest.fixture
+def mock_config():
+    """Mock configuration for testing."""
+    return {
+        "s3": {
+            "endpoint": "http://localhost:9000",
+            "bucket": "test-bucket",
+            "access_key": "test-key",
+            "secret_key": "test-secret",
+            "use_ssl": False,
+            "verify_ssl": False,
+        },
+        "performance": {"parallel_readers": 2, "use_categorical": True},
+    }
+
+
+@pytest.fixture
+def reader(mock_config):
+    """ParquetReader without an S3 filesystem."""
+    with patch.object(ParquetReader, "_create_s3_filesystem"):
+        return ParquetReader(mock_config)
+
+
+class TestParquetReader:
+    """Test suite for ParquetReader."""
+
+    def test_optimize_dataframe_memory_keeps_costs_float64(self, reader):
+        """Test cost columns are not downcast to float32 while other floats are."""
+        df = pd.DataFrame(
+            {
+                "namespace": ["a", "b"],
+                "lineitem_unblendedcost": [12345.6789, 0.1],
+                "lineitem_usageamount": [24.0, 1.0],
+                "pod_usage_cpu_core_hours": [1.0, 2.0],
+            }
+        )
+
+        result = reader._optimize_dataframe_memory(df)
+
+        assert isinstance(result["namespace"].dtype, pd.CategoricalDtype)
+        assert result["lineitem_unblendedcost"].dtype == "float64"
+        assert result["lineitem_unblendedcost"].iloc[0] == 12345.6789
+        assert result["lineitem_usageamount"].dtype == "float32"
+        assert result["pod_usage_cpu_core_hours"].dtype == "float64"
+
+
+@pytest.fixture
+def local_reader(reader):
+    """ParquetReader reading local files through an fsspec filesystem."""
+    from fsspec.implementations.local import LocalFileSystem
+
+    reader.fs = LocalFileSystem()
+    return reader
+
+
+def write_parquet(path, data):
+    """Write a DataFrame to a local Parquet file and return its pseudo S3 URI."""
+    pd.DataFrame(data).to_parquet(path, index=False)
+    return f"s3://{path}"
+
+
+class TestReadFilesParallel:
+    """Test suite for multi-file reads."""
+
+    def test_dataset_scan_unifies_schemas(self, local_reader, tmp_path):
+        """Test files with different optional columns are combined, missing values as nulls."""
+        files = [
+            write_parquet(tmp_path / "a.parquet", {"namespace": ["ns1", "ns2"], "usage": [1.0, 2.0]}),
+            write_parquet(tmp_path / "b.parquet", {"namespace": ["ns1"], "usage": [3.0], "extra": ["x"]}),
+        ]
+
+        result = local_reader._read_files_parallel(files, max_workers=2, categorical_columns=["extra"])
+
+        assert len(result) == 3
+        assert result["usage"].sum() == 6.0
+        assert result["extra"].isna().sum() == 2
+        assert isinstance(result["namespace"].dtype, pd.CategoricalDtype)
+        assert isinstance(result["extra"].dtype, pd.CategoricalDtype)
+
+    def test_schema_conflict_falls_back_with_same_dtypes(self, local_reader, tmp_path):
+        """Test conflicting column types fall back to per-file reads that still return categoricals."""
+        files = [
+            write_parquet(tmp_path / "a.parquet", {"namespace": ["ns1"], "code": [1], "region": ["us-east-1"]}),
+            write_parquet(tmp_path / "b.parquet", {"namespace": ["ns2"], "code": ["B"], "region": ["eu-west-1"]}),
+        ]
+
+        result = local_reader._read_files_parallel(files, max_workers=2, categorical_columns=["region"])
+
+        assert len(result) == 2
+        assert isinstance(result["namespace"].dtype, pd.CategoricalDtype)
+        assert isinstance(result["region"].dtype, pd.CategoricalDtype)
+
+    def test_other_errors_are_raised(self, local_reader, tmp_path):
+        """Test errors other than schema merge failures are not hidden by the fallback."""
+        files = [write_parquet(tmp_path / "a.parquet", {"namespace": ["ns1"]})]
+
+        with patch.object(local_reader, "read_parquet_schema", side_effect=PermissionError("denied")):
+            with patch.object(local_reader, "_read_files_threaded") as fallback:
+                with pytest.raises(PermissionError):
+                    local_reader._read_files_parallel(files)
+
+        fallback.assert_not_called()
+
+
+class TestParquetMetadata:
+    """Test suite for footer caching and statistics pruning."""
+
+    def test_listed_files_need_no_info_request(self, local_reader, tmp_path):
+        """Test footers of listed files are looked up by their listing ETag/mtime, without fs.info."""
+        (tmp_path / "month=10").mkdir()
+        write_parquet(tmp_path / "month=10" / "a.parquet", {"namespace": ["ns1"]})
+        local_reader.bucket = str(tmp_path)
+
+        files = local_reader.list_parquet_files("month=10")
+        assert len(files) == 1
+
+        with patch.object(local_reader.fs, "info", side_effect=AssertionError("unexpected HEAD")):
+            with patch("src.parquet_reader.pq.read_metadata", wraps=pq.read_metadata) as read_metadata:
+                first = local_reader.read_parquet_metadata(files[0])
+                second = local_reader.read_parquet_metadata(files[0])
+
+        assert first is second
+        assert read_metadata.call_count <= 1
+
+    def test_file_may_contain_incomparable_statistics(self, local_reader, tmp_path):
+        """Test statistics that cannot be compared with the values keep the file."""
+        path = tmp_path / "binary.parquet"
+        pq.write_table(pa.table({"lineitem_productcode": pa.array([b"AmazonEC2", b"AmazonS3"], pa.binary())}), path)
+
+        assert local_reader.file_may_contain(f"s3://{path}", "lineitem_productcode", ["AmazonEC2"])
+
+    def test_file_may_contain_prunes_by_statistics(self, local_reader, tmp_path):
+        """Test files whose min/max range excludes every value are pruned."""
+        uri = write_parquet(tmp_path / "s3.parquet", {"lineitem_productcode": ["AmazonS3", "AmazonS3"]})
+
+        assert not local_reader.file_may_contain(uri, "lineitem_productcode", ["AmazonEC2"])
+        assert local_reader.file_may_contain(uri, "lineitem_productcode", ["AmazonS3"])
@@ -0,0 +1,122 @@
+"""
+Unit tests for S3 Adapter
+
+Tests the shared connection handling and parquet helpers of src.s3_adapter
+against local files (no S3 required).
+"""
+
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.fs as pafs
+import pytest
+
+from src import s3_adapter
+
+
+@pytest.fixture
+def local_parquet(tmp_path):
+    """Local parquet file addressed as (bucket, key) through a local pyarrow filesystem."""
+    pd.DataFrame({"namespace": ["ns1", "ns2", "ns3"], "cost": [1.0, 2.0, 3.0]}).to_parquet(
+        tmp_path / "data.parquet", index=False
+    )
+    with patch.object(s3_adapter, "get_s3_filesystem", return_value=pafs.LocalFileSystem()):
+        yield str(tmp_path), "data.parquet"
+
+
+class TestS3Connections:
+    """Test suite for the shared client/filesystem."""
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_connections_reset_after_fork(self):
+        """Test a forked child starts without the parent's client and filesystem."""
+        with patch.object(s3_adapter, "_s3_client", object()), patch.object(s3_adapter, "_s3_filesystem", object()):
+            pid = os.fork()
+            if pid == 0:
+                ok = s3_adapter._s3_client is None and s3_adapter._s3_filesystem is None
+                os._exit(0 if ok else 1)
+
+            _, status = os.waitpid(pid, 0)
+            assert os.WEXITSTATUS(status) == 0
+            # The parent keeps its connections
+            assert s3_adapter._s3_client is not None
+
+
+class TestParquetReads:
+    """Test suite for the parquet read helpers."""
+
+    def test_read_parquet_from_s3_closes_stream(self, local_parquet):
+        """Test the returned ParquetFile owns its stream and closes it on exit."""
+        bucket, key = local_parquet
+
+        with s3_adapter.read_parquet_from_s3(bucket, key) as parquet_file:
+            assert parquet_file.read(columns=["namespace"]).num_rows == 3
+
+        assert parquet_file.closed
+
+    def test_read_parquet_batches_from_s3(self, local_parquet):
+        """Test batches cover every row."""
+        bucket, key = local_parquet
+
+        chunks = list(s3_adapter.read_parquet_batches_from_s3(bucket, key, batch_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert pd.concat(chunks)["cost"].sum() == 6.0
+
+    def test_read_parquet_tables_overlaps_listing_and_keeps_order(self):
+        """Test reads start while listing continues and results come back in listing order."""
+        first_read_started = threading.Event()
+        overlapped = []
+
+        def list_keys(bucket, prefix):
+            yield "a.parquet"
+            # The next page is only listed once the first read is under way
+            overlapped.append(first_read_started.wait(timeout=5))
+            yield "b.parquet"
+            yield "c.parquet"
+
+        def read_table(bucket, key, columns):
+            if key == "a.parquet":
+                first_read_started.set()
+                time.sleep(0.2)  # finishes last
+            return pa.table({"key": [key]})
+
+        with (
+            patch.object(s3_adapter, "get_s3_config", return_value={"max_workers": 4}),
+            patch.object(s3_adapter, "get_s3_filesystem"),
+            patch.object(s3_adapter, "_iter_parquet_keys", side_effect=list_keys),
+            patch.object(s3_adapter, "read_parquet_table_from_s3", side_effect=read_table),
+        ):
+            results = list(s3_adapter.read_parquet_tables_from_s3("bucket", "prefix/"))
+
+        assert overlapped == [True]
+        assert [key for key, _ in results] == ["a.parquet", "b.parquet", "c.parquet"]
+        assert [table["key"][0].as_py() for _, table in results] == ["a.parquet", "b.parquet", "c.parquet"]
+
+    def test_read_parquet_tables_bounds_reads_in_flight(self):
+        """Test results are yielded before listing ends once max_workers * 2 reads are in flight."""
+        keys = [f"{i}.parquet" for i in range(10)]
+        listed = []
+
+        def list_keys(bucket, prefix):
+            for key in keys:
+                listed.append(key)
+                yield key
+
+        with (
+            patch.object(s3_adapter, "get_s3_config", return_value={"max_workers": 2}),
+            patch.object(s3_adapter, "get_s3_filesystem"),
+            patch.object(s3_adapter, "_iter_parquet_keys", side_effect=list_keys),
+            patch.object(s3_adapter, "read_parquet_table_from_s3", return_value=pa.table({"x": [1]})),
+        ):
+            reader = s3_adapter.read_parquet_tables_from_s3("bucket", "prefix/")
+            first_key, _ = next(reader)
+            listed_before_first_result = len(listed)
+            results = [first_key] + [key for key, _ in reader]
+
+        assert listed_before_first_result == 5
+        assert results == keys
@@ -7,6 +7,7 @@ Tests the TagMatcher class for matching AWS resources to OCP by tags.
 import json
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 from src.tag_matcher import TagMatcher
@@ -120,6 +121,47 @@ class TestTagMatcher:
         assert "backend" in tag_values["namespaces"]
         assert "frontend" in tag_values["namespaces"]
 
+        # Frozen so they can be reused across match_by_tags calls
+        assert all(isinstance(values, frozenset) for values in tag_values.values())
+
+    def test_extract_ocp_tag_values_categorical(self, mock_config, sample_pod_usage):
+        """Test categorical columns yield only the categories still in use."""
+        matcher = TagMatcher(mock_config)
+
+        pod_usage = sample_pod_usage.astype({"node": "category", "namespace": "category"})
+        pod_usage = pod_usage[pod_usage["namespace"] == pod_usage["namespace"].iloc[0]]
+
+        result = matcher.extract_ocp_tag_values(cluster_id="my-cluster", pod_usage_df=pod_usage)
+
+        assert result["namespaces"] == {pod_usage["namespace"].iloc[0]}
+        assert result["node_names"] == set(pod_usage["node"].astype(object))
+
+    @pytest.mark.parametrize("as_arrow", [False, True])
+    def test_extract_ocp_tag_values_labels(self, mock_config, sample_pod_usage, as_arrow):
+        """Test pod and volume labels become "key=value" sets (JSON and pipe formats, pandas or Arrow)."""
+        matcher = TagMatcher(mock_config)
+
+        pod_usage = sample_pod_usage.assign(
+            pod_labels=[json.dumps({"app": "api", "tier": "web"}), "app:web|env:prod", None]
+        )
+        storage_usage = pd.DataFrame(
+            {
+                "persistentvolume_labels": [json.dumps({"storage": "ssd"}), None],
+                "persistentvolumeclaim_labels": [json.dumps({"storage": "ssd", "team": "a"}), ""],
+            }
+        )
+        if as_arrow:
+            pod_usage = pa.Table.from_pandas(pod_usage, preserve_index=False)
+            storage_usage = pa.Table.from_pandas(storage_usage, preserve_index=False)
+
+        result = matcher.extract_ocp_tag_values(
+            cluster_id="my-cluster", pod_usage_df=pod_usage, storage_usage_df=storage_usage
+        )
+
+        assert result["pod_labels"] == {"app=api", "tier=web", "app=web", "env=prod"}
+        assert result["volume_labels"] == {"storage=ssd", "team=a"}
+        assert result["node_names"] == set(sample_pod_usage["node"])
+
     def test_extract_ocp_tag_values_empty(self, mock_config):
         """Test extraction from empty DataFrame."""
         matcher = TagMatcher(mock_config)
@@ -150,6 +192,7 @@ class TestTagMatcher:
         assert matcher.parse_aws_tags("") == {}
         assert matcher.parse_aws_tags(None) == {}
         assert matcher.parse_aws_tags(pd.NA) == {}
+        assert matcher.parse_aws_tags(float("nan")) == {}
 
     def test_parse_aws_tags_invalid(self, mock_config):
         """Test parsing invalid JSON."""
@@ -157,6 +200,8 @@ class TestTagMatcher:
 
         assert matcher.parse_aws_tags("invalid json") == {}
         assert matcher.parse_aws_tags("{broken") == {}
+        assert matcher.parse_aws_tags('["not", "an", "object"]') == {}
+        assert matcher.parse_aws_tags('{"unterminated": "}') == {}
 
     def test_filter_by_enabled_keys(self, mock_config):
         """Test filtering tags by enabled keys."""
@@ -177,6 +222,9 @@ class TestTagMatcher:
         assert "env" in filtered
         assert "app" in filtered
         assert "tier" not in filtered  # Not enabled
+        assert list(filtered) == ["openshift_cluster", "env", "app"]  # Tag order kept
+        assert matcher.filter_by_enabled_keys(aws_tags, {"owner"}) == {}
+        assert matcher.filter_by_enabled_keys(aws_tags, set(aws_tags) | {"owner"}) == aws_tags
 
     def test_filter_by_enabled_keys_empty(self, mock_config):
         """Test filtering with no enabled keys."""
@@ -336,6 +384,78 @@ class TestTagMatcher:
         with pytest.raises(ValueError, match="missing 'resourcetags'"):
             matcher.match_by_tags(aws_data, ocp_tag_values)
 
+    def test_match_by_tags_in_place_unless_copy(self, mock_config, sample_pod_usage, sample_aws_data_with_tags):
+        """Test that columns are added to the input frame unless copy=True."""
+        matcher = TagMatcher(mock_config)
+        ocp_tag_values = matcher.extract_ocp_tag_values(cluster_id="my-cluster", pod_usage_df=sample_pod_usage)
+
+        copied = matcher.match_by_tags(sample_aws_data_with_tags, ocp_tag_values, copy=True)
+        assert copied is not sample_aws_data_with_tags
+        assert "tag_matched" not in sample_aws_data_with_tags.columns
+
+        result = matcher.match_by_tags(sample_aws_data_with_tags, ocp_tag_values)
+        assert result is sample_aws_data_with_tags
+        assert result["tag_matched"].tolist() == copied["tag_matched"].tolist()
+
+    def test_match_by_tags_parallel_parse(self, mock_config, sample_pod_usage):
+        """Test that parsing distinct tags on worker threads gives the same result as serial parsing."""
+        aws_data = pd.DataFrame(
+            {
+                "resourcetags": [json.dumps({"openshift_project": "backend", "id": str(i)}) for i in range(3000)]
+                + ["not json", None],
+                "resource_id_matched": False,
+            }
+        )
+        serial = TagMatcher(mock_config)
+        parallel = TagMatcher({"performance": {"tag_parse_workers": 4}})
+        ocp_tag_values = serial.extract_ocp_tag_values(cluster_id="my-cluster", pod_usage_df=sample_pod_usage)
+
+        expected = serial.match_by_tags(aws_data, ocp_tag_values, copy=True)
+        result = parallel.match_by_tags(aws_data, ocp_tag_values, copy=True)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result["tag_matched"].sum() == 3000
+
+    def test_match_by_tags_alias_and_labels(self, mock_config):
+        """Test cluster alias, pod label and volume label matches (in priority order)."""
+        matcher = TagMatcher(mock_config)
+
+        aws_data = pd.DataFrame(
+            {
+                "lineitem_resourceid": ["r-1", "r-2", "r-3", "r-4"],
+                "resourcetags": [
+                    json.dumps({"openshift_cluster": "prod-alias"}),
+                    json.dumps({"openshift_node": "unknown", "team": "a", "app": "web"}),
+                    json.dumps({"team": "a"}),
+                    json.dumps({"app": "other"}),
+                ],
+                "resource_id_matched": [False, False, False, False],
+            }
+        )
+        ocp_tag_values = {
+            "cluster_ids": {"my-cluster"},
+            "cluster_aliases": {"prod-alias"},
+            "node_names": set(),
+            "namespaces": set(),
+            "pod_labels": {"app=web"},
+            "volume_labels": {"team=a"},
+        }
+
+        result = matcher.match_by_tags(aws_data, ocp_tag_values)
+
+        assert list(result["tag_matched"]) == [True, True, True, False]
+        assert isinstance(result["matched_tag"].dtype, pd.CategoricalDtype)
+        assert result["matched_ocp_cluster"].dtype == "string[pyarrow]"
+        assert list(result["matched_tag"][:3]) == [
+            "openshift_cluster=prod-alias (alias)",
+            "app=web (pod_labels)",
+            "team=a (volume_labels)",
+        ]
+        assert pd.isna(result["matched_tag"].iloc[3])
+        assert result["matched_ocp_cluster"].iloc[0] == "prod-alias"
+        assert list(result["match_type"][1:3]) == ["pod_labels", "volume_labels"]
+        assert pd.isna(result["match_type"].iloc[0])
+
     def test_get_tag_matching_summary(self, mock_config, sample_pod_usage, sample_aws_data_with_tags):
         """Test generation of tag matching summary."""
         matcher = TagMatcher(mock_config)